@@ -1,3 +1,4 @@
+import argparse
 from gui.CryptocurrencyPredictionGUI import TradingApp
 import ttkbootstrap as ttk
 import matplotlib
@@ -7,10 +8,23 @@ matplotlib.rcParams['font.sans-serif'] = ['Microsoft JhengHei']
 matplotlib.rcParams['axes.unicode_minus'] = False
 
 def main():
+    parser = argparse.ArgumentParser(description="AI 智慧交易視覺系統")
+    parser.add_argument("--replay", help="重播錄製資料（.csv / .npz / 資料夾），不連線交易所")
+    parser.add_argument("--speed", type=float, default=1.0, help="重播倍速（1–1000）")
+    args = parser.parse_args()
+
+    fetcher = None
+    if args.replay:
+        from core import ReplayFetcher
+        fetcher = ReplayFetcher(args.replay, speed=args.speed)
+
     root = ttk.Window(themename="cyborg")
-    TradingApp(root)
+    TradingApp(root, fetcher=fetcher)
     root.mainloop()
     root.state('zoomed')
 
+    if fetcher is not None:
+        print(f"[Replay] {fetcher.stats()}")
+
 if __name__ == "__main__":
     main()
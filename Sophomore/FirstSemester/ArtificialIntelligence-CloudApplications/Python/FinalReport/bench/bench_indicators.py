@@ -0,0 +1,50 @@
+"""
+2-D 指標 benchmark
+比較「對每個代號迴圈呼叫 pandas 版 ema / rsi / macd」與「(代號數 × 時間) 陣列一次算完」的時間，
+並確認兩者結果一致。
+
+執行：python bench/bench_indicators.py
+"""
+import os
+import sys
+import time
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core import SyntheticMarket, ema, rsi, macd, ema_2d, rsi_2d, macd_2d
+from core.indicators import _HAS_SCIPY
+
+
+def timed(fn, repeats: int = 3) -> tuple[float, object]:
+    best, out = float("inf"), None
+    for _ in range(repeats):
+        t = time.perf_counter()
+        out = fn()
+        best = min(best, time.perf_counter() - t)
+    return best, out
+
+
+def bench(n_symbols: int, n_bars: int):
+    frames = SyntheticMarket(seed=n_symbols).generate(n_symbols, n_bars, tf="1m")
+    series = [df["Close"] for df in frames.values()]
+    close = np.vstack([s.to_numpy() for s in series])
+
+    cases = {
+        "ema": (lambda: [ema(s, 20) for s in series], lambda: ema_2d(close, 20)),
+        "rsi": (lambda: [rsi(s, 14) for s in series], lambda: rsi_2d(close, 14)),
+        "macd": (lambda: [macd(s)[2] for s in series], lambda: macd_2d(close)[2]),
+    }
+    for name, (loop_fn, vec_fn) in cases.items():
+        t_loop, ref = timed(loop_fn)
+        t_vec, out = timed(vec_fn)
+        ok = np.allclose(np.vstack([r.to_numpy() for r in ref]), out, equal_nan=True)
+        print(f"{name:>5} {n_symbols:>5} {n_bars:>6} {t_loop * 1000:>10.1f} {t_vec * 1000:>10.1f} "
+              f"{t_loop / t_vec:>7.1f}x {'ok' if ok else 'MISMATCH':>6}")
+
+
+if __name__ == "__main__":
+    print(f"scipy.signal.lfilter: {'yes' if _HAS_SCIPY else 'no (numpy fallback)'}")
+    print(f"{'ind':>5} {'syms':>5} {'bars':>6} {'loop (ms)':>10} {'2-D (ms)':>10} {'speedup':>8} {'check':>6}")
+    for n_symbols, n_bars in ((50, 3000), (200, 3000), (200, 10000)):
+        bench(n_symbols, n_bars)
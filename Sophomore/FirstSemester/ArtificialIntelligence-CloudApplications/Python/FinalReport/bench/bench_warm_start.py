@@ -0,0 +1,49 @@
+"""
+Prophet warm start benchmark
+比較「多一根 K 線後重新擬合」時，冷啟動與 warm start 的擬合時間。
+
+執行：python bench/bench_warm_start.py
+"""
+import os
+import sys
+import time
+import logging
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+logging.getLogger("cmdstanpy").disabled = True
+
+from core import Predictor, SyntheticMarket
+
+
+def make_hist(df):
+    hist = df[["Close"]].reset_index()
+    hist.columns = ["ds", "y"]
+    hist["y"] = np.log(hist["y"])
+    return hist
+
+
+def bench(rows: int, repeats: int = 5) -> tuple[float, float]:
+    df = SyntheticMarket(seed=rows).generate(1, rows + repeats, tf="1m")["SYN0"]
+    cold, warm = [], []
+    p = Predictor(warm_start=True, max_history=rows)
+    p._fit_prophet(make_hist(df.iloc[:rows]), warm_key=("bench", "1m"))
+    for i in range(1, repeats + 1):
+        # 每次多一根 K 線（視窗往前滑動）
+        hist = make_hist(df.iloc[i:rows + i])
+
+        t = time.perf_counter()
+        Predictor(warm_start=False)._fit_prophet(hist)
+        cold.append(time.perf_counter() - t)
+
+        t = time.perf_counter()
+        p._fit_prophet(hist, warm_key=("bench", "1m"))
+        warm.append(time.perf_counter() - t)
+    return float(np.median(cold)), float(np.median(warm))
+
+
+if __name__ == "__main__":
+    print(f"{'rows':>6} {'cold (s)':>10} {'warm (s)':>10} {'speedup':>8}")
+    for rows in (1000, 3000, 10000):
+        cold, warm = bench(rows)
+        print(f"{rows:>6} {cold:>10.3f} {warm:>10.3f} {cold / warm:>7.1f}x")
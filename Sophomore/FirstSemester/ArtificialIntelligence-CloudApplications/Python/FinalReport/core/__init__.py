@@ -7,21 +7,83 @@ AI 智慧交易視覺系統的核心模組
 
 # --- 模組導入 ---
 from .data_fetcher import DataFetcher, FetchResult
-from .predictor import Predictor
-from .indicators import rsi, macd, ema
+from .cache import OHLCVCache
+from .synthetic import SyntheticMarket
+from .scheduler import (
+    RequestScheduler, TokenBucket, get_scheduler,
+    PRIORITY_TICK, PRIORITY_FETCH, PRIORITY_BACKFILL
+)
+from .resample import Resampler, resample_ohlcv
+from .predictor import Predictor, ForecastPool, ModelStore, BACKENDS, register_backend, available_backends
+from .backtest import walk_forward, summarize
+from .indicators import (
+    rsi, macd, ema, StreamingEMA, StreamingRSI, StreamingMACD,
+    ema_2d, rsi_2d, macd_2d
+)
+from .indicator_graph import IndicatorGraph, register_node
+from .downsample import downsample, lttb, minmax_buckets
 from .sounder import Sounder
-from .utils import tf_tier, REFRESH_BY_TIER, TIMEFRAME_CHOICES
+from .bars import BarBuilder
+from .replay import ReplayFetcher, ReplayClock, load_recording
+from .recorder import TickRecorder
+from .stream import (
+    Tick, TickStream, Transport, PollingTransport, CcxtProTransport,
+    ReplayTransport, SimulatedTransport, default_transport
+)
+from .utils import tf_tier, tf_seconds, REFRESH_BY_TIER, TIMEFRAME_CHOICES
 
 # --- 匯出介面 ---
 __all__ = [
     "DataFetcher",
     "FetchResult",
+    "OHLCVCache",
+    "SyntheticMarket",
+    "RequestScheduler",
+    "TokenBucket",
+    "get_scheduler",
+    "PRIORITY_TICK",
+    "PRIORITY_FETCH",
+    "PRIORITY_BACKFILL",
+    "Resampler",
+    "resample_ohlcv",
     "Predictor",
+    "ForecastPool",
+    "ModelStore",
+    "BACKENDS",
+    "register_backend",
+    "available_backends",
+    "walk_forward",
+    "summarize",
     "rsi",
     "macd",
     "ema",
+    "StreamingEMA",
+    "StreamingRSI",
+    "StreamingMACD",
+    "ema_2d",
+    "rsi_2d",
+    "macd_2d",
+    "IndicatorGraph",
+    "register_node",
+    "downsample",
+    "lttb",
+    "minmax_buckets",
     "Sounder",
+    "BarBuilder",
+    "ReplayFetcher",
+    "ReplayClock",
+    "load_recording",
+    "TickRecorder",
+    "Tick",
+    "TickStream",
+    "Transport",
+    "PollingTransport",
+    "CcxtProTransport",
+    "ReplayTransport",
+    "SimulatedTransport",
+    "default_transport",
     "tf_tier",
+    "tf_seconds",
     "REFRESH_BY_TIER",
     "TIMEFRAME_CHOICES"
 ]
@@ -0,0 +1,105 @@
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+
+from .predictor import Predictor, BACKENDS
+
+
+# ---------------------------------------------
+# 單一 fold（在 worker 程序中執行）
+# ---------------------------------------------
+def _run_fold(hist: pd.DataFrame, actual: np.ndarray, tf: str, backend: str, horizon: int,
+              max_history: int) -> dict:
+    """
+    hist 最後一列視為「目前形成中的 K 線」，與 GUI 呼叫 Predictor.forecast 的情境相同：
+    只用已收盤 K 線擬合，預測接下來 horizon 根，再與實際收盤價比較。
+    """
+    p = Predictor(max_history=max_history, warm_start=False)
+    unit_name, val, pandas_freq = p._parse_tf(tf)
+    ds, y = p._prepare(hist)
+
+    t = time.perf_counter()
+    model = BACKENDS[backend]().fit(ds, y)
+    fit_s = time.perf_counter() - t
+
+    future = pd.date_range(start=hist.index[-1] + pd.Timedelta(val, unit=unit_name),
+                           periods=horizon, freq=pandas_freq)
+    t = time.perf_counter()
+    fcst = p._clamp(p._to_frame(future, *model.predict(future)), hist)
+    predict_s = time.perf_counter() - t
+
+    n = min(len(actual), horizon)
+    yhat = fcst["yhat"].to_numpy()[:n]
+    lower = fcst["yhat_lower"].to_numpy()[:n]
+    upper = fcst["yhat_upper"].to_numpy()[:n]
+    actual = actual[:n]
+    base = float(hist["Close"].iloc[-1])
+    return {
+        "backend": backend,
+        "tf": tf,
+        "origin": hist.index[-1],
+        "mape": float(np.mean(np.abs((actual - yhat) / actual)) * 100),
+        "direction": float(np.mean(np.sign(yhat - base) == np.sign(actual - base))),
+        "coverage": float(np.mean((actual >= lower) & (actual <= upper))),
+        "fit_s": fit_s,
+        "predict_s": predict_s,
+    }
+
+
+# ---------------------------------------------
+# Walk-forward 回測
+# ---------------------------------------------
+def walk_forward(df: pd.DataFrame, tf: str = "1m", backends=("holt_winters",), horizon: int = 10,
+                 stride: int = 50, min_train: int = 300, max_history: int = 1000,
+                 workers: int | None = None) -> pd.DataFrame:
+    """
+    在歷史序列上每隔 stride 根重新擬合一次，各 fold 以程序池平行執行。
+    回傳每個 fold 一列的 DataFrame（backend, tf, origin, mape, direction, coverage, fit_s, predict_s）。
+    """
+    close = df["Close"].to_numpy(dtype=np.float64)
+    origins = range(min_train, len(df) - 1, stride)
+    tasks = []
+    for backend in backends:
+        if backend not in BACKENDS:
+            print(f"[Backtest] unknown backend: {backend}")
+            continue
+        for i in origins:
+            # 只送出擬合會用到的視窗（已收盤 max_history 根 + 形成中的一根）
+            hist = df.iloc[max(0, i - max_history):i + 1]
+            tasks.append((hist, close[i + 1:i + 1 + horizon], tf, backend, horizon, max_history))
+    if not tasks:
+        return pd.DataFrame()
+
+    n = workers or os.cpu_count() or 1
+    rows = []
+    with ProcessPoolExecutor(max_workers=n) as ex:
+        futs = [ex.submit(_run_fold, *task) for task in tasks]
+        for fut, task in zip(futs, tasks):
+            try:
+                rows.append(fut.result())
+            except Exception as e:
+                print(f"[Backtest] fold {task[3]} @ {task[0].index[-1]} failed: {e}")
+    return pd.DataFrame(rows)
+
+
+def summarize(folds: pd.DataFrame) -> pd.DataFrame:
+    """依 (backend, tf) 彙總：平均 MAPE / 方向準確率 / 區間覆蓋率與擬合、預測延遲分位數（毫秒）"""
+    if folds.empty:
+        return folds
+
+    def pct(q):
+        return lambda s: float(np.percentile(s, q) * 1000)
+
+    return folds.groupby(["backend", "tf"]).agg(
+        folds=("mape", "size"),
+        mape=("mape", "mean"),
+        direction=("direction", "mean"),
+        coverage=("coverage", "mean"),
+        fit_ms_p50=("fit_s", pct(50)),
+        fit_ms_p95=("fit_s", pct(95)),
+        fit_ms_p99=("fit_s", pct(99)),
+        predict_ms_p50=("predict_s", pct(50)),
+        predict_ms_p95=("predict_s", pct(95)),
+    )
@@ -0,0 +1,99 @@
+import threading
+import numpy as np
+import pandas as pd
+
+from .utils import tf_seconds
+
+
+class BarBuilder:
+    """
+    將即時 tick 聚合成 N 秒 OHLCV K 線。
+    - 固定大小的 numpy 環狀緩衝區（不會隨時間無限成長）
+    - tick 落在目前 bucket → 更新 High/Low/Close/Volume
+    - 跨過 bucket 邊界 → 開新 K 線（邊界以最後一根 K 線為錨點）
+    """
+
+    def __init__(self, tf: str | int, capacity: int = 3000):
+        self.seconds = tf if isinstance(tf, int) else tf_seconds(tf)
+        self.step_ns = self.seconds * 1_000_000_000
+        self.capacity = capacity
+        self._ts = np.zeros(capacity, dtype=np.int64)
+        self._ohlcv = np.zeros((capacity, 5), dtype=np.float64)
+        self._head = 0      # 下一個寫入位置
+        self._count = 0
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return self._count
+
+    # -----------------------------------------
+    # 內部工具
+    # -----------------------------------------
+    def _last_slot(self) -> int:
+        return (self._head - 1) % self.capacity
+
+    def _push(self, ts_ns: int, o: float, h: float, l: float, c: float, v: float):
+        self._ts[self._head] = ts_ns
+        self._ohlcv[self._head] = (o, h, l, c, v)
+        self._head = (self._head + 1) % self.capacity
+        self._count = min(self._count + 1, self.capacity)
+
+    # -----------------------------------------
+    # 對外介面
+    # -----------------------------------------
+    def seed(self, df: pd.DataFrame):
+        """用既有歷史 K 線初始化緩衝區"""
+        with self._lock:
+            self._head = 0
+            self._count = 0
+            if df is None or df.empty:
+                return
+            tail = df.tail(self.capacity)
+            ts = tail.index.values.astype("datetime64[ns]").astype(np.int64)
+            close = tail["Close"].to_numpy(dtype=np.float64)
+            cols = [tail[c].to_numpy(dtype=np.float64) if c in tail.columns else close
+                    for c in ("Open", "High", "Low")]
+            vol = tail["Volume"].to_numpy(dtype=np.float64) if "Volume" in tail.columns \
+                else np.zeros(len(tail))
+            n = len(tail)
+            self._ts[:n] = ts
+            self._ohlcv[:n] = np.column_stack(cols + [close, vol])
+            self._head = n % self.capacity
+            self._count = n
+
+    def update(self, ts: float, price: float, volume: float = 0.0) -> bool:
+        """
+        餵入一筆 tick（ts 為 epoch 秒）。回傳 True 表示開了新 K 線。
+        bucket 以最後一根 K 線為錨點（last + k*step），與種子歷史的對齊方式一致
+        （Binance 週 K 從週一開始、yfinance 依交易時段），而不是對齊 Unix epoch；
+        早於最後一根開始時間的 tick（時鐘誤差等）併入最後一根，不會被丟掉。
+        """
+        ts_ns = int(ts * 1_000_000_000)
+        with self._lock:
+            if self._count:
+                i = self._last_slot()
+                last = int(self._ts[i])
+                if ts_ns < last + self.step_ns:
+                    row = self._ohlcv[i]
+                    row[1] = max(row[1], price)
+                    row[2] = min(row[2], price)
+                    row[3] = price
+                    row[4] += volume
+                    return False
+                bucket = last + (ts_ns - last) // self.step_ns * self.step_ns
+            else:
+                bucket = ts_ns // self.step_ns * self.step_ns
+            self._push(bucket, price, price, price, price, volume)
+            return True
+
+    def to_frame(self, last: int | None = None) -> pd.DataFrame:
+        """依時間順序輸出 OHLCV DataFrame（last=n 只取最後 n 根）"""
+        with self._lock:
+            n = self._count if last is None else min(last, self._count)
+            order = (self._head - n + np.arange(n)) % self.capacity
+            ts = self._ts[order]
+            data = self._ohlcv[order]
+        return pd.DataFrame(
+            data, columns=["Open", "High", "Low", "Close", "Volume"],
+            index=pd.to_datetime(ts, unit="ns")
+        )
@@ -0,0 +1,127 @@
+import os
+import re
+import glob
+import threading
+import numpy as np
+import pandas as pd
+
+# ---------------------------------------------
+# 預設快取目錄（FinalReport/cache/ohlcv）
+# ---------------------------------------------
+DEFAULT_CACHE_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "cache", "ohlcv"
+)
+
+OHLCV_COLUMNS = ["Open", "High", "Low", "Close", "Volume"]
+
+
+def _safe_name(text: str) -> str:
+    """把 BTC/USDT 之類的代號轉成可用的檔名"""
+    return re.sub(r"[^0-9A-Za-z._-]+", "_", text)
+
+
+class OHLCVCache:
+    """
+    以 (source, symbol, timeframe) 為單位的本地 K 線快取。
+    - 每個 key 一個資料夾，內含多個 .npz 區段檔（每欄一個陣列，欄式儲存）
+    - merge() 只寫入新區段，不重寫整份歷史；區段數過多時自動 compact
+    - 讀取時依時間戳合併去重，後寫入者覆蓋先寫入者（最後一根未收盤 K 線會被更新）
+    """
+
+    def __init__(self, root: str | None = None, max_segments: int = 16):
+        self.root = root or DEFAULT_CACHE_DIR
+        self.max_segments = max_segments
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.RLock()
+        self._last_ts: dict[tuple, pd.Timestamp] = {}
+
+    # -----------------------------------------
+    # 路徑與區段
+    # -----------------------------------------
+    def _dir(self, source: str, symbol: str, tf: str) -> str:
+        return os.path.join(self.root, _safe_name(source), _safe_name(symbol), _safe_name(tf))
+
+    def _segments(self, path: str) -> list[str]:
+        return sorted(glob.glob(os.path.join(path, "seg-*.npz")))
+
+    def _write_segment(self, path: str, df: pd.DataFrame, seq: int):
+        os.makedirs(path, exist_ok=True)
+        arrays = {"ts": df.index.values.astype("datetime64[ns]").astype(np.int64)}
+        for col in OHLCV_COLUMNS:
+            arrays[col] = df[col].to_numpy(dtype=np.float64) if col in df.columns \
+                else np.full(len(df), np.nan)
+        tmp = os.path.join(path, f".seg-{seq:08d}.tmp.npz")
+        np.savez(tmp, **arrays)
+        os.replace(tmp, os.path.join(path, f"seg-{seq:08d}.npz"))
+
+    @staticmethod
+    def _read_segment(file: str) -> pd.DataFrame:
+        with np.load(file) as z:
+            idx = pd.to_datetime(z["ts"], unit="ns")
+            return pd.DataFrame({col: z[col] for col in OHLCV_COLUMNS}, index=idx)
+
+    @staticmethod
+    def _next_seq(segments: list[str]) -> int:
+        if not segments:
+            return 0
+        return int(os.path.basename(segments[-1])[4:12]) + 1
+
+    # -----------------------------------------
+    # 對外介面
+    # -----------------------------------------
+    def load(self, source: str, symbol: str, tf: str) -> pd.DataFrame | None:
+        """讀取整份快取（依時間排序、去重）；沒有快取回傳 None"""
+        with self._lock:
+            segments = self._segments(self._dir(source, symbol, tf))
+            if not segments:
+                return None
+            parts = [self._read_segment(f) for f in segments]
+        df = pd.concat(parts)
+        df = df[~df.index.duplicated(keep="last")].sort_index()
+        df.index.name = "ts"
+        if len(df):
+            self._last_ts[(source, symbol, tf)] = df.index[-1]
+        return df
+
+    def last_timestamp(self, source: str, symbol: str, tf: str) -> pd.Timestamp | None:
+        """最後一根快取 K 線的時間（delta 抓取的起點）"""
+        key = (source, symbol, tf)
+        if key not in self._last_ts:
+            df = self.load(source, symbol, tf)
+            if df is None or df.empty:
+                return None
+        return self._last_ts.get(key)
+
+    def merge(self, source: str, symbol: str, tf: str, df: pd.DataFrame):
+        """把新抓到的 K 線寫入快取（新區段），必要時自動 compact"""
+        if df is None or df.empty:
+            return
+        key = (source, symbol, tf)
+        with self._lock:
+            path = self._dir(source, symbol, tf)
+            segments = self._segments(path)
+            self._write_segment(path, df.sort_index(), self._next_seq(segments))
+            last = df.index.max()
+            if key not in self._last_ts or last > self._last_ts[key]:
+                self._last_ts[key] = last
+            if len(segments) + 1 > self.max_segments:
+                self.compact(source, symbol, tf)
+
+    def compact(self, source: str, symbol: str, tf: str):
+        """把所有區段合併成單一區段"""
+        with self._lock:
+            path = self._dir(source, symbol, tf)
+            segments = self._segments(path)
+            if len(segments) <= 1:
+                return
+            df = self.load(source, symbol, tf)
+            self._write_segment(path, df, self._next_seq(segments))
+            for f in segments:
+                os.remove(f)
+
+    def clear(self, source: str, symbol: str, tf: str):
+        with self._lock:
+            for f in self._segments(self._dir(source, symbol, tf)):
+                os.remove(f)
+            self._last_ts.pop((source, symbol, tf), None)
@@ -1,18 +1,35 @@
-import pandas as pd
+import time
+import shutil
+import asyncio
+import tempfile
+import threading
+from functools import partial
+from concurrent.futures import ThreadPoolExecutor, as_completed, wait, FIRST_COMPLETED
 import numpy as np
-from datetime import datetime
-from dataclasses import dataclass
+import pandas as pd
+from dataclasses import dataclass, field
+
+from .cache import OHLCVCache
+from .synthetic import SyntheticMarket
+from .utils import tf_seconds
+from .scheduler import get_scheduler, PRIORITY_TICK, PRIORITY_BACKFILL
 
 # ---------------------------------------------
 # Optional libraries
 # ---------------------------------------------
 _HAS_CCXT = False
+_HAS_CCXT_ASYNC = False
 _HAS_YF = False
 try:
     import ccxt
     _HAS_CCXT = True
 except Exception:
     pass
+try:
+    import ccxt.async_support as ccxt_async
+    _HAS_CCXT_ASYNC = True
+except Exception:
+    pass
 try:
     import yfinance as yf
     _HAS_YF = True
@@ -28,19 +45,52 @@ class FetchResult:
     df: pd.DataFrame
     last_price: float
     source: str
+    cache_hits: int = 0      # 此 fetcher 累計的快取命中次數
+    cache_misses: int = 0    # 此 fetcher 累計的快取未命中次數
+    symbol: str = ""
+    error: str | None = None # 抓取過程中遇到的錯誤（含 fallback 前的失敗）
+    latencies: dict = field(default_factory=dict)   # 競速模式：各來源耗時（秒），逾時或被取消為 None
 
 
 # ---------------------------------------------
 # Main Fetcher
 # ---------------------------------------------
 class DataFetcher:
-    def __init__(self):
+    # 單次回傳給 Prophet 的最大根數
+    MAX_BARS = 3000
+    # 競速模式每個來源的預設逾時（秒）；race_timeout 為 dict 且沒列到的來源用這個
+    RACE_TIMEOUT = 10.0
+
+    # yfinance 的 interval 對應（秒級週期沒有對應 interval，
+    # 歷史以 1m 補上，即時 K 線由 core.bars.BarBuilder 以 tick 聚合）
+    YF_INTERVAL_MAP = {
+        "1s": "1m", "5s": "1m", "10s": "1m", "30s": "1m",
+        "1m": "1m", "5m": "5m", "15m": "15m", "30m": "30m",
+        "1h": "60m", "4h": "60m", "1d": "1d", "1w": "1wk"
+    }
+
+    def __init__(self, cache: OHLCVCache | None = None, use_cache: bool = True,
+                 session=None, quote_ttl: float = 1.0, scheduler=None,
+                 synthetic_seed: int | None = None, race: bool = False,
+                 race_exchanges: tuple = ("binance", "okx", "bybit"), race_timeout: float | dict = 10.0):
+        self.cache = (cache or OHLCVCache()) if use_cache else None
+        self.scheduler = scheduler or get_scheduler()   # 共用限速 / 優先權 / 重試
+        self.synthetic = SyntheticMarket(synthetic_seed)
+        self.session = session              # 共用的 HTTP session（交給 yfinance）
+        self.quote_ttl = quote_ttl          # 股票報價的記憶時間（秒）
+        self._tickers = {}                  # symbol → yf.Ticker（重複使用）
+        self._quotes = {}                   # symbol → (monotonic 時間, 價格)
+        self._quote_lock = threading.Lock()
+        self.race = race                    # True → fetch_initial 同時向多個來源競速
+        self.race_exchanges = race_exchanges
+        self.race_timeout = race_timeout    # 秒數，或 {來源: 秒數}
         self.exchange = None
         if _HAS_CCXT:
             try:
                 self.exchange = ccxt.binance()
             except Exception:
                 self.exchange = None
+        self._exchanges = {"binance": self.exchange} if self.exchange else {}
 
     def is_crypto(self, symbol: str) -> bool:
         """判斷是否為加密貨幣（含有 / 符號）"""
@@ -50,85 +100,390 @@ class DataFetcher:
     # Synthetic fallback data
     # -----------------------------------------
     def _synthetic_series(self, n=300, start=100.0) -> FetchResult:
-        """無法抓取資料時產生假資料"""
-        idx = pd.date_range(end=datetime.now(), periods=n, freq="min")
-        base = start + 2 * np.sin(np.linspace(0, 8 * np.pi, n))
-        noise = np.random.normal(0, 0.5, n)
-        close = base + noise
-        open_ = close + np.random.normal(0, 0.2, n)
-        high = np.maximum(open_, close) + np.abs(np.random.normal(0, 0.4, n))
-        low = np.minimum(open_, close) - np.abs(np.random.normal(0, 0.4, n))
-        vol = np.random.randint(100, 1000, n)
-        df = pd.DataFrame({
-            "Open": open_,
-            "High": high,
-            "Low": low,
-            "Close": close,
-            "Volume": vol
-        }, index=idx)
-        return FetchResult(df, float(close[-1]), "synthetic")
+        """無法抓取資料時產生假資料（狀態切換模型，seed 固定時可重現）"""
+        df = self.synthetic.generate(1, n, model="regime", start=start)["SYN0"]
+        df["Volume"] = df["Volume"].round()
+        return FetchResult(df, float(df["Close"].iloc[-1]), "synthetic")
 
     # -----------------------------------------
     # Initial OHLCV Fetch
     # -----------------------------------------
-    def fetch_initial(self, symbol: str, tf: str, lookback: int | None = None) -> FetchResult:
+    def fetch_initial(self, symbol: str, tf: str, lookback: int | None = None,
+                      race: bool | None = None) -> FetchResult:
         """
         初始抓取 OHLCV 資料：
         - Crypto → 使用 CCXT (Binance)
         - Stock → 使用 YFinance
         - 無資料 → 使用 synthetic 模擬波
+        race=None 依 self.race；需要來源固定的呼叫端（例如 Resampler 的 base，之後要接 backfill）傳 False
         """
 
-        # 自動決定抓取範圍（越大 Prophet 越穩定）
-        if lookback is None:
-            if tf.endswith("s") or tf.endswith("m"):
-                lookback = 2000
-            elif tf.endswith("h"):
-                lookback = 1500
-            else:  # 日或週
-                lookback = 1000
+        if self.race if race is None else race:
+            return self.fetch_race(symbol, tf, lookback)
+
+        lookback = lookback or self._default_lookback(tf)
+        errors = []
 
         # -------------------------------------
         # 1️⃣ Crypto via CCXT
         # -------------------------------------
         if self.is_crypto(symbol) and self.exchange:
             try:
-                ohlcv = self.exchange.fetch_ohlcv(symbol, timeframe=tf, limit=lookback)
-                df = pd.DataFrame(ohlcv, columns=["ts", "Open", "High", "Low", "Close", "Volume"])
-                df["ts"] = pd.to_datetime(df["ts"], unit="ms")
-                df = df.set_index("ts").tz_localize(None)
-                # 限制最多 3000 根，以免 Prophet 太慢
-                df = df.tail(3000)
-                return FetchResult(df, float(df["Close"].iloc[-1]), "ccxt")
+                res = self._fetch_cached("ccxt", symbol, tf, lookback, lookback, self._ccxt_ohlcv)
+                res.symbol = symbol
+                return res
             except Exception as e:
                 print(f"[DataFetcher] CCXT error: {e}")
+                errors.append(f"CCXT error: {e}")
 
         # -------------------------------------
         # 2️⃣ Stocks via YFinance
         # -------------------------------------
         if _HAS_YF:
             try:
-                # timeframe 對應 interval
-                interval_map = {
-                    "1s": "1m", "5s": "1m", "10s": "1m", "30s": "1m",
-                    "1m": "1m", "5m": "5m", "15m": "15m", "30m": "30m",
-                    "1h": "60m", "4h": "60m", "1d": "1d", "1w": "1wk"
-                }
-                yf_tf = interval_map.get(tf, "1h")
-                period = "1y" if "h" in tf or "d" in tf else "7d"
-
-                data = yf.Ticker(symbol).history(period=period, interval=yf_tf, prepost=True, actions=False)
-                data = data.rename(columns=str.title)
-                data = data[["Open", "High", "Low", "Close", "Volume"]].dropna()
-                data = data.tail(3000)
-                return FetchResult(data, float(data["Close"].iloc[-1]), "yfinance")
+                res = self._fetch_cached("yfinance", symbol, tf, lookback, self.MAX_BARS, self._yf_ohlcv)
+                res.symbol = symbol
+                res.error = "; ".join(errors) or None
+                return res
             except Exception as e:
                 print(f"[DataFetcher] YFinance error: {e}")
+                errors.append(f"YFinance error: {e}")
 
         # -------------------------------------
         # 3️⃣ Fallback synthetic data
         # -------------------------------------
-        return self._synthetic_series()
+        res = self._synthetic_series()
+        res.symbol = symbol
+        res.error = "; ".join(errors) or None
+        return res
+
+    # -----------------------------------------
+    # Hedged multi-source fetch
+    # -----------------------------------------
+    def fetch_race(self, symbol: str, tf: str, lookback: int | None = None,
+                   timeout: float | dict | None = None) -> FetchResult:
+        """
+        多來源競速：同時向所有可用來源（crypto → 多個 ccxt 交易所；股票 → yfinance）發出請求，
+        採用第一個有效結果，其餘取消；每個來源各自逾時。
+        FetchResult.source 為勝出的來源，latencies 記錄每個來源的耗時（逾時 / 被取消為 None）。
+        """
+        lookback = lookback or self._default_lookback(tf)
+        timeout = self.race_timeout if timeout is None else timeout
+
+        # 勝出後 set：還在排程器佇列中的落敗請求直接撤掉，執行中的不再重試
+        cancel = threading.Event()
+        budget = {}
+        candidates = {}
+        if self.is_crypto(symbol) and _HAS_CCXT:
+            for ex_id in self.race_exchanges:
+                name = "ccxt" if ex_id == "binance" else f"ccxt:{ex_id}"
+                loader = partial(self._ccxt_ohlcv, exchange_id=ex_id, cancel=cancel)
+                candidates[name] = partial(self._fetch_cached, name, symbol, tf, lookback, lookback, loader)
+        # yfinance 不認得 BTC/USDT 這類代號，crypto 不參賽，免得浪費 yfinance 的限速額度
+        if _HAS_YF and not self.is_crypto(symbol):
+            candidates["yfinance"] = partial(self._fetch_cached, "yfinance", symbol, tf, lookback,
+                                             self.MAX_BARS, partial(self._yf_ohlcv, cancel=cancel))
+        for name in candidates:
+            budget[name] = float(timeout.get(name, self.RACE_TIMEOUT)) if isinstance(timeout, dict) \
+                else float(timeout)
+            # 只參加競速的交易所：HTTP 逾時不超過競速預算，卡住的請求不會長時間佔住排程器 worker
+            ex_id = name.partition(":")[2]
+            if ex_id:
+                try:
+                    ex = self._get_exchange(ex_id)
+                    ex.timeout = min(ex.timeout, int(budget[name] * 1000))
+                except Exception:
+                    pass
+
+        def timed(fn):
+            t = time.monotonic()
+            try:
+                return fn(), time.monotonic() - t
+            except Exception as e:
+                e.elapsed = time.monotonic() - t
+                raise
+
+        latencies, errors, winner = {}, [], None
+        if candidates:
+            pool = ThreadPoolExecutor(max_workers=len(candidates))
+            t0 = time.monotonic()
+            futs = {pool.submit(timed, fn): name for name, fn in candidates.items()}
+            deadline = {name: t0 + budget[name] for name in candidates}
+            pending = set(futs)
+            while pending and winner is None:
+                now = time.monotonic()
+                for f in [f for f in pending if deadline[futs[f]] <= now]:
+                    pending.discard(f)
+                    latencies[futs[f]] = None
+                    errors.append(f"{futs[f]}: timeout")
+                if not pending:
+                    break
+                done, _ = wait(pending, timeout=min(deadline[futs[f]] for f in pending) - now,
+                               return_when=FIRST_COMPLETED)
+                for f in done:
+                    pending.discard(f)
+                    name = futs[f]
+                    try:
+                        res, latencies[name] = f.result()
+                        if winner is None and not res.df.empty:
+                            winner = res
+                    except Exception as e:
+                        latencies[name] = getattr(e, "elapsed", None)
+                        errors.append(f"{name}: {e}")
+            # 尚未完成的來源記為 None（已取消）
+            for f in pending:
+                latencies[futs[f]] = None
+            cancel.set()
+            pool.shutdown(wait=False, cancel_futures=True)
+
+        if winner is None:
+            winner = self._synthetic_series()
+        winner.symbol = symbol
+        winner.latencies = latencies
+        winner.error = "; ".join(errors) or None
+        return winner
+
+    def _default_lookback(self, tf: str) -> int:
+        """自動決定抓取範圍（越大 Prophet 越穩定）"""
+        if tf.endswith("s") or tf.endswith("m"):
+            return 2000
+        if tf.endswith("h"):
+            return 1500
+        return 1000  # 日或週
+
+    # -----------------------------------------
+    # Async multi-symbol fetch
+    # -----------------------------------------
+    async def fetch_many(self, symbols: list[str], tf: str, lookback: int | None = None,
+                         concurrency: int = 8):
+        """
+        非同步同時抓取多個代號（async generator，完成一個就 yield 一個 FetchResult）：
+        - Crypto → ccxt.async_support，所有代號共用同一個 exchange 連線
+        - Stock → yfinance（丟到 thread 執行）
+        - 以 Semaphore 限制同時請求數；快取讀寫在專用的 concurrency 條執行緒上做，
+          不受 asyncio 預設執行緒池（CPU 數 + 4）限制
+        - 每個代號的錯誤記錄在 FetchResult.error，不會退回 synthetic 假資料
+        """
+        lookback = lookback or self._default_lookback(tf)
+        sem = asyncio.Semaphore(concurrency)
+        loop = asyncio.get_running_loop()
+        pool = ThreadPoolExecutor(max_workers=concurrency)
+        exchange = None
+        if _HAS_CCXT_ASYNC and any(self.is_crypto(s) for s in symbols):
+            exchange = ccxt_async.binance()
+
+        def ccxt_async_loader(symbol, tf, lookback, since=None):
+            # 權杖 / 優先權 / 429 重試 / 佇列指標都經由排程器（call_async），
+            # 但請求本身在主 event loop 上 await，不佔排程器 worker，同時請求數只受 concurrency 限制
+            since_ms = int(since.value // 1_000_000) if since is not None else None
+            call = self.scheduler.call_async(
+                "binance", lambda: exchange.fetch_ohlcv(symbol, timeframe=tf, since=since_ms, limit=lookback))
+            ohlcv = asyncio.run_coroutine_threadsafe(call, loop).result()
+            df = pd.DataFrame(ohlcv, columns=["ts", "Open", "High", "Low", "Close", "Volume"])
+            df["ts"] = pd.to_datetime(df["ts"], unit="ms")
+            return df.set_index("ts")
+
+        async def one(symbol: str) -> FetchResult:
+            async with sem:
+                try:
+                    if self.is_crypto(symbol):
+                        if exchange is None:
+                            raise RuntimeError("ccxt async support not available")
+                        res = await loop.run_in_executor(pool, self._fetch_cached, "ccxt", symbol, tf,
+                                                         lookback, lookback, ccxt_async_loader)
+                    else:
+                        if not _HAS_YF:
+                            raise RuntimeError("yfinance not available")
+                        res = await loop.run_in_executor(pool, self._fetch_cached, "yfinance", symbol, tf,
+                                                         lookback, self.MAX_BARS, self._yf_ohlcv)
+                except Exception as e:
+                    res = FetchResult(pd.DataFrame(), float("nan"), "error", error=f"{type(e).__name__}: {e}")
+                res.symbol = symbol
+                return res
+
+        try:
+            for fut in asyncio.as_completed([one(s) for s in symbols]):
+                yield await fut
+        finally:
+            if exchange is not None:
+                await exchange.close()
+            pool.shutdown(wait=False)
+
+    def fetch_many_sync(self, symbols: list[str], tf: str, lookback: int | None = None,
+                        concurrency: int = 8) -> list[FetchResult]:
+        """fetch_many 的同步包裝（依完成順序回傳）"""
+        async def collect():
+            return [res async for res in self.fetch_many(symbols, tf, lookback, concurrency)]
+        return asyncio.run(collect())
+
+    # -----------------------------------------
+    # Source loaders（since=None → 完整抓取；否則只抓 since 之後）
+    # -----------------------------------------
+    def _get_exchange(self, exchange_id: str):
+        ex = self._exchanges.get(exchange_id)
+        if ex is None:
+            ex = getattr(ccxt, exchange_id)()
+            self._exchanges[exchange_id] = ex
+        return ex
+
+    def _ccxt_ohlcv(self, symbol: str, tf: str, lookback: int, since: pd.Timestamp | None = None,
+                    exchange_id: str = "binance", cancel: threading.Event | None = None) -> pd.DataFrame:
+        since_ms = int(since.value // 1_000_000) if since is not None else None
+        ohlcv = self.scheduler.call(exchange_id, self._get_exchange(exchange_id).fetch_ohlcv, symbol,
+                                    timeframe=tf, since=since_ms, limit=lookback, cancel=cancel)
+        df = pd.DataFrame(ohlcv, columns=["ts", "Open", "High", "Low", "Close", "Volume"])
+        df["ts"] = pd.to_datetime(df["ts"], unit="ms")
+        return df.set_index("ts").tz_localize(None)
+
+    def _yf_ohlcv(self, symbol: str, tf: str, lookback: int, since: pd.Timestamp | None = None,
+                  cancel: threading.Event | None = None) -> pd.DataFrame:
+        yf_tf = self.YF_INTERVAL_MAP.get(tf, "1h")
+        if since is not None:
+            # 快取時間是 naive UTC；yfinance 會把 naive start 當成交易所時區，必須明確標成 UTC
+            data = self.scheduler.call("yfinance", self._yf_ticker(symbol).history, cancel=cancel,
+                                       start=since.tz_localize("UTC"), interval=yf_tf, prepost=True, actions=False)
+        else:
+            period = "1y" if "h" in tf or "d" in tf else "7d"
+            data = self.scheduler.call("yfinance", self._yf_ticker(symbol).history, cancel=cancel,
+                                       period=period, interval=yf_tf, prepost=True, actions=False)
+        data = data.rename(columns=str.title)
+        data = data[["Open", "High", "Low", "Close", "Volume"]].dropna()
+        if data.index.tz is not None:
+            data.index = data.index.tz_convert("UTC").tz_localize(None)
+        return data
+
+    # -----------------------------------------
+    # Incremental cache
+    # -----------------------------------------
+    def _cache_key_tf(self, source: str, tf: str) -> str:
+        """yfinance 的 4h 實際上是 60m 資料，快取以實際 interval 為準"""
+        return self.YF_INTERVAL_MAP.get(tf, "1h") if source == "yfinance" else tf
+
+    def _fetch_cached(self, source: str, symbol: str, tf: str, lookback: int, keep: int, loader) -> FetchResult:
+        """
+        先讀本地快取，只向來源要求最後一根快取 K 線之後的資料再合併。
+        只要快取非空且與現在的缺口不超過 lookback 根就算命中（來源本身可能一次給不到 lookback 根，
+        例如 Binance 單次上限 1000 根、yfinance 1y 日 K 約 250 根，不能以 lookback 判斷）；
+        沒有快取或缺口太大時，改為完整抓取並寫回快取。
+        """
+        cached = None
+        if self.cache is not None:
+            ctf = self._cache_key_tf(source, tf)
+            cached = self.cache.load(source, symbol, ctf)
+            if cached is not None and not cached.empty:
+                gap_bars = (pd.Timestamp.now("UTC").tz_localize(None) - cached.index[-1]).total_seconds() / tf_seconds(tf)
+                if gap_bars >= lookback:
+                    cached = None
+            else:
+                cached = None
+
+        if cached is not None:
+            self.cache.hits += 1
+            # 從最後一根（可能尚未收盤）開始抓，讓它被最新資料覆蓋
+            delta = loader(symbol, tf, lookback, since=cached.index[-1])
+            self.cache.merge(source, symbol, ctf, delta)
+            df = pd.concat([cached, delta])
+            df = df[~df.index.duplicated(keep="last")].sort_index()
+        else:
+            df = loader(symbol, tf, lookback)
+            if self.cache is not None:
+                self.cache.misses += 1
+                self.cache.merge(source, symbol, ctf, df)
+
+        df = df.tail(min(keep, self.MAX_BARS)).copy()
+        hits, misses = (self.cache.hits, self.cache.misses) if self.cache is not None else (0, 0)
+        return FetchResult(df, float(df["Close"].iloc[-1]), source, hits, misses)
+
+    # -----------------------------------------
+    # Deep-history backfill (CCXT)
+    # -----------------------------------------
+    def backfill(self, symbol: str, tf: str, bars: int, page_size: int = 1000,
+                 max_workers: int = 4, before: pd.Timestamp | None = None) -> FetchResult:
+        """
+        往回分頁抓取長歷史：
+        - 由現在（或 before 之前一根）往回切出 since 游標，每頁 page_size 根
+        - 快取裡已經連續的區段不再抓，只抓缺的頭尾（暖啟動通常只剩最新一頁）
+        - 多執行緒並行送出，經由共用排程器限速（回補優先權最低）
+        - 每頁抓到就直接寫入快取（不在記憶體累積），最後合併去重
+        - 指定 before 時只回傳 before 之前的 bars 根（供 Resampler 補足較舊的 base）
+        - use_cache=False 時分頁暫存在臨時資料夾，結束後刪除，不會寫入預設快取
+        """
+        if not (self.is_crypto(symbol) and self.exchange):
+            return self.fetch_initial(symbol, tf)
+
+        tmp_dir = None if self.cache is not None else tempfile.mkdtemp(prefix="backfill-")
+        cache = self.cache or OHLCVCache(tmp_dir)
+        try:
+            return self._backfill_pages(cache, symbol, tf, bars, page_size, max_workers, before)
+        finally:
+            if tmp_dir is not None:
+                shutil.rmtree(tmp_dir, ignore_errors=True)
+
+    @staticmethod
+    def _cached_run(cached: pd.DataFrame | None, end_ms: int, max_gap_ms: int) -> tuple[int, int] | None:
+        """快取中 end_ms（含）之前最後一段連續資料的 (第一根, 最後一根) 毫秒；缺口超過 max_gap_ms 視為斷開"""
+        if cached is None or cached.empty:
+            return None
+        ts = cached.index.values.astype("datetime64[ms]").astype(np.int64)
+        ts = ts[ts <= end_ms]
+        if not len(ts):
+            return None
+        breaks = np.flatnonzero(np.diff(ts) > max_gap_ms)
+        return int(ts[breaks[-1] + 1] if len(breaks) else ts[0]), int(ts[-1])
+
+    def _backfill_pages(self, cache: OHLCVCache, symbol: str, tf: str, bars: int, page_size: int,
+                        max_workers: int, before: pd.Timestamp | None) -> FetchResult:
+        step_ms = tf_seconds(tf) * 1000
+        if before is None:
+            # 目前（尚未收盤）K 線的開始時間；要包含它，last_price 才是最新的
+            end_ms = int(time.time() * 1000) // step_ms * step_ms
+        else:
+            end_ms = int(before.value // 1_000_000) - step_ms
+        start_ms = end_ms - (bars - 1) * step_ms
+
+        # 只抓快取連續區段以外的部分：較舊的缺口，以及最後一根（可能未收盤）到 end_ms
+        run = self._cached_run(cache.load("ccxt", symbol, tf), end_ms, page_size * step_ms)
+        if run is None:
+            missing = [(start_ms, end_ms)]
+        else:
+            first, last = run
+            missing = []
+            if first > start_ms:
+                missing.append((start_ms, first - step_ms))
+            if last < end_ms or before is None:
+                missing.append((last, end_ms))
+        cursors = []
+        for lo, hi in missing:
+            n_pages = max(1, -(-((hi - lo) // step_ms + 1) // page_size))
+            cursors += [max(lo, hi - ((k + 1) * page_size - 1) * step_ms) for k in range(n_pages)]
+
+        def fetch_page(since_ms: int) -> int:
+            ohlcv = self.scheduler.call("binance", self.exchange.fetch_ohlcv, symbol, timeframe=tf,
+                                        since=since_ms, limit=page_size, priority=PRIORITY_BACKFILL)
+            if not ohlcv:
+                return 0
+            df = pd.DataFrame(ohlcv, columns=["ts", "Open", "High", "Low", "Close", "Volume"])
+            df["ts"] = pd.to_datetime(df["ts"], unit="ms")
+            cache.merge("ccxt", symbol, tf, df.set_index("ts"))
+            return len(df)
+
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            futures = {pool.submit(fetch_page, c): c for c in cursors}
+            for fut in as_completed(futures):
+                try:
+                    fut.result()
+                except Exception as e:
+                    print(f"[DataFetcher] backfill page since={futures[fut]} failed: {e}")
+
+        if cursors:
+            cache.compact("ccxt", symbol, tf)
+        df = cache.load("ccxt", symbol, tf)
+        if df is not None and before is not None:
+            df = df[df.index < before]
+        if df is None or df.empty:
+            return self.fetch_initial(symbol, tf)
+        df = df.tail(bars).copy()
+        return FetchResult(df, float(df["Close"].iloc[-1]), "ccxt", cache.hits, cache.misses, symbol)
 
     # -----------------------------------------
     # Realtime Ticker Fetch
@@ -138,17 +493,51 @@ class DataFetcher:
         # 加密貨幣
         if self.is_crypto(symbol) and self.exchange:
             try:
-                return float(self.exchange.fetch_ticker(symbol)["last"])
+                ticker = self.scheduler.call("binance", self.exchange.fetch_ticker, symbol,
+                                             priority=PRIORITY_TICK)
+                return float(ticker["last"])
             except Exception:
                 return None
 
         # 股票
         if _HAS_YF:
             try:
-                info = yf.Ticker(symbol).history(period="7d", interval="1m", prepost=True, actions=False)
-                if len(info) > 0:
-                    return float(info["Close"].iloc[-1])
+                return self._yf_last_quote(symbol)
             except Exception:
                 return None
 
         return None
+
+    def _yf_ticker(self, symbol: str):
+        """重複使用 Ticker 物件（與其 HTTP session）"""
+        t = self._tickers.get(symbol)
+        if t is None:
+            t = yf.Ticker(symbol, session=self.session) if self.session is not None else yf.Ticker(symbol)
+            self._tickers[symbol] = t
+        return t
+
+    def _yf_last_quote(self, symbol: str) -> float | None:
+        """
+        股票最新報價：TTL 內直接回傳記憶值；
+        否則只抓最近幾分鐘的 1m K 線，休市時改抓最近幾天的日 K。
+        """
+        now = time.monotonic()
+        with self._quote_lock:
+            memo = self._quotes.get(symbol)
+            if memo is not None and now - memo[0] < self.quote_ttl:
+                return memo[1]
+
+        t = self._yf_ticker(symbol)
+        start = pd.Timestamp.now("UTC") - pd.Timedelta(minutes=10)
+        info = self.scheduler.call("yfinance", t.history, start=start, interval="1m",
+                                   prepost=True, actions=False, priority=PRIORITY_TICK)
+        if len(info) == 0:
+            info = self.scheduler.call("yfinance", t.history, period="5d", interval="1d",
+                                       prepost=True, actions=False, priority=PRIORITY_TICK)
+        if len(info) == 0:
+            return None
+
+        price = float(info["Close"].iloc[-1])
+        with self._quote_lock:
+            self._quotes[symbol] = (now, price)
+        return price
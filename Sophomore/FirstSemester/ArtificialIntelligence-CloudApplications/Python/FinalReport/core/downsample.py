@@ -0,0 +1,61 @@
+import numpy as np
+
+
+# ==========================================================
+# 📉 LOD 降採樣（畫面上的頂點數只跟像素寬度有關，與資料長度無關）
+# ==========================================================
+def minmax_buckets(x: np.ndarray, y: np.ndarray, n_buckets: int) -> tuple[np.ndarray, np.ndarray]:
+    """
+    每個 bucket（通常 = 一個像素寬）保留最小值與最大值兩點，依原本的先後順序輸出，
+    尖峰不會被抹平；第一點與最後一點一定保留。全部向量化（reshape + argmin/argmax）。
+    """
+    x = np.asarray(x)
+    y = np.asarray(y, dtype=np.float64)
+    n = len(y)
+    if n_buckets <= 0 or n <= 2 * n_buckets + 2:
+        return x, y
+    per = -(-n // n_buckets)
+    nb = -(-n // per)
+    # 補到 per 的整數倍（補最後一個值，不影響 min/max）
+    padded = np.concatenate([y, np.full(nb * per - n, y[-1])]).reshape(nb, per)
+    # NaN 不參與比較
+    lo = np.where(np.isnan(padded), np.inf, padded).argmin(axis=1)
+    hi = np.where(np.isnan(padded), -np.inf, padded).argmax(axis=1)
+    base = np.arange(nb) * per
+    idx = np.concatenate([[0], np.minimum(base + lo, n - 1), np.minimum(base + hi, n - 1), [n - 1]])
+    idx = np.unique(idx)        # 排序 + 去重，保持時間順序
+    return x[idx], y[idx]
+
+
+def lttb(x: np.ndarray, y: np.ndarray, n_out: int) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Largest-Triangle-Three-Buckets：每個 bucket 挑與「前一個選中點、下一個 bucket 平均點」
+    圍成三角形面積最大的點，形狀保留比單純抽樣好。迴圈只跑 n_out 次，bucket 內向量化。
+    """
+    x = np.asarray(x)
+    y = np.asarray(y, dtype=np.float64)
+    n = len(y)
+    if n_out >= n or n_out < 3:
+        return x, y
+    xf = x.astype(np.float64)
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    idx = np.empty(n_out, dtype=np.int64)
+    idx[0], idx[-1] = 0, n - 1
+    a = 0
+    for i in range(n_out - 2):
+        lo, hi = edges[i], max(edges[i + 1], edges[i] + 1)
+        nxt_lo, nxt_hi = hi, (edges[i + 2] if i + 2 < len(edges) else n)
+        cx = xf[nxt_lo:max(nxt_hi, nxt_lo + 1)].mean()
+        cy = np.nanmean(y[nxt_lo:max(nxt_hi, nxt_lo + 1)])
+        area = np.abs((xf[a] - cx) * (y[lo:hi] - y[a]) - (xf[a] - xf[lo:hi]) * (cy - y[a]))
+        a = lo + int(np.nanargmax(area)) if np.isfinite(area).any() else lo
+        idx[i + 1] = a
+    return x[idx], y[idx]
+
+
+def downsample(x: np.ndarray, y: np.ndarray, pixels: int, method: str = "minmax") -> tuple[np.ndarray, np.ndarray]:
+    """依像素寬度降採樣：minmax 每像素 2 點；lttb 每像素 1 點"""
+    pixels = max(int(pixels), 1)
+    if method == "lttb":
+        return lttb(x, y, pixels)
+    return minmax_buckets(x, y, pixels)
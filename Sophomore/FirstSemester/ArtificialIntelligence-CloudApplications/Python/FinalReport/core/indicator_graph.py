@@ -0,0 +1,144 @@
+import threading
+from collections import OrderedDict
+import numpy as np
+import pandas as pd
+
+
+# ==========================================================
+# 🕸️ 指標 DAG 節點註冊表
+# ==========================================================
+# 每個節點是 fn(graph, series_id, *params) -> pd.Series / tuple，
+# 節點內透過 graph.node(...) 取用上游節點，因此共同的中間結果（EMA、差分、漲跌平均）
+# 在同一個資料版本內只計算一次，RSI / MACD / 之後新增的指標共用。
+NODES: dict[str, callable] = {}
+
+
+def register_node(name: str):
+    def deco(fn):
+        NODES[name] = fn
+        return fn
+    return deco
+
+
+@register_node("close")
+def _close(g, sid):
+    return g.series(sid)
+
+
+@register_node("ema")
+def _ema(g, sid, span, source="close", *source_params):
+    return g.node(sid, source, *source_params).ewm(span=span, adjust=False).mean()
+
+
+@register_node("delta")
+def _delta(g, sid):
+    return g.node(sid, "close").diff()
+
+
+@register_node("avg_gain")
+def _avg_gain(g, sid, period):
+    gain = g.node(sid, "delta").clip(lower=0)
+    return gain.ewm(alpha=1 / period, min_periods=period).mean()
+
+
+@register_node("avg_loss")
+def _avg_loss(g, sid, period):
+    loss = -g.node(sid, "delta").clip(upper=0)
+    return loss.ewm(alpha=1 / period, min_periods=period).mean()
+
+
+@register_node("rsi")
+def _rsi(g, sid, period=14):
+    rs = g.node(sid, "avg_gain", period) / g.node(sid, "avg_loss", period).replace(0, np.nan)
+    return 100 - (100 / (1 + rs))
+
+
+@register_node("macd_line")
+def _macd_line(g, sid, fast=12, slow=26):
+    return g.node(sid, "ema", fast) - g.node(sid, "ema", slow)
+
+
+@register_node("macd")
+def _macd(g, sid, fast=12, slow=26, signal=9):
+    line = g.node(sid, "macd_line", fast, slow)
+    signal_line = g.node(sid, "ema", signal, "macd_line", fast, slow)
+    return line, signal_line, line - signal_line
+
+
+class IndicatorGraph:
+    """
+    共用中間結果的指標計算圖：
+    - set_series() 更新資料時版本號 +1，並釋放該序列舊版本的結果
+    - 結果以 (series_id, version, 節點名稱, 參數) 為 key 快取，超過 max_entries 依 LRU 淘汰
+    - 例如 macd(12, 26, 9) 與另一個用到 ema(12) 的指標共用同一條 EMA
+    """
+
+    def __init__(self, max_entries: int = 256):
+        self.max_entries = max_entries
+        self._series: dict[str, tuple[int, pd.Series]] = {}
+        self._cache: OrderedDict = OrderedDict()
+        self._lock = threading.RLock()
+        self.hits = 0
+        self.misses = 0
+
+    # -----------------------------------------
+    # 資料版本
+    # -----------------------------------------
+    def set_series(self, series_id: str, close: pd.Series, version: int | None = None) -> int:
+        """登錄 / 更新收盤價序列；未指定 version 時自動遞增"""
+        with self._lock:
+            old = self._series.get(series_id)
+            if version is None:
+                version = old[0] + 1 if old is not None else 0
+            self._series[series_id] = (version, close)
+            # 舊版本的結果不會再被查到，直接釋放
+            for k in [k for k in self._cache if k[0] == series_id and k[1] != version]:
+                del self._cache[k]
+            return version
+
+    def version(self, series_id: str) -> int:
+        return self._series[series_id][0]
+
+    def series(self, series_id: str) -> pd.Series:
+        return self._series[series_id][1]
+
+    # -----------------------------------------
+    # 節點求值（含 LRU 快取）
+    # -----------------------------------------
+    def node(self, series_id: str, name: str, *params):
+        with self._lock:
+            key = (series_id, self.version(series_id), name) + params
+            hit = self._cache.get(key)
+            if hit is not None:
+                self._cache.move_to_end(key)
+                self.hits += 1
+                return hit
+            self.misses += 1
+            value = NODES[name](self, series_id, *params)
+            self._cache[key] = value
+            while len(self._cache) > self.max_entries:
+                self._cache.popitem(last=False)
+            return value
+
+    def invalidate(self, series_id: str | None = None):
+        """丟掉某個序列（或全部）的快取與資料"""
+        with self._lock:
+            if series_id is None:
+                self._cache.clear()
+                self._series.clear()
+                return
+            for k in [k for k in self._cache if k[0] == series_id]:
+                del self._cache[k]
+            self._series.pop(series_id, None)
+
+    # -----------------------------------------
+    # 常用指標（與 core.indicators 的批次函式結果相同）
+    # -----------------------------------------
+    def ema(self, series_id: str, span: int) -> pd.Series:
+        return self.node(series_id, "ema", span)
+
+    def rsi(self, series_id: str, period: int = 14) -> pd.Series:
+        return self.node(series_id, "rsi", period)
+
+    def macd(self, series_id: str, fast: int = 12, slow: int = 26, signal: int = 9):
+        return self.node(series_id, "macd", fast, slow, signal)
@@ -1,6 +1,14 @@
 import pandas as pd
 import numpy as np
 
+# scipy optional（2-D 指標用 lfilter 做向量化遞迴濾波）
+_HAS_SCIPY = False
+try:
+    from scipy.signal import lfilter
+    _HAS_SCIPY = True
+except Exception:
+    _HAS_SCIPY = False
+
 def ema(series: pd.Series, span: int):
     """指數移動平均"""
     return series.ewm(span=span, adjust=False).mean()
@@ -21,3 +29,167 @@ def macd(close, fast=12, slow=26, signal=9):
     signal_line = ema(macd_line, signal)
     hist = macd_line - signal_line
     return macd_line, signal_line, hist
+
+
+# ==========================================================
+# ⚡ 串流版指標（每根 K 線 O(1) 更新）
+# ==========================================================
+# update(x)：新 K 線收盤 / 開新 K 線；revise(x)：改寫仍在形成中的最後一根
+# 內部保留「最後一根之前」的狀態，revise 時由該狀態重算，不必回溯整段歷史。
+# 非有限值（NaN / inf）不會改變狀態。
+class _StreamingIndicator:
+    def __init__(self):
+        self._state = None
+        self._prev = None
+
+    def _step(self, state, x: float):
+        raise NotImplementedError
+
+    def _value(self, state):
+        raise NotImplementedError
+
+    @property
+    def value(self):
+        return self._value(self._state)
+
+    def update(self, x: float):
+        self._prev = self._state
+        if np.isfinite(x):
+            self._state = self._step(self._prev, float(x))
+        return self.value
+
+    def revise(self, x: float):
+        if self._state is None:
+            return self.update(x)
+        if np.isfinite(x):
+            self._state = self._step(self._prev, float(x))
+        return self.value
+
+    def seed(self, values):
+        """以歷史資料初始化（O(n) 一次），回傳最後一個值"""
+        for x in np.asarray(values, dtype=np.float64):
+            self.update(x)
+        return self.value
+
+
+class StreamingEMA(_StreamingIndicator):
+    """與 ema(series, span) 相同（adjust=False）"""
+    def __init__(self, span: int):
+        super().__init__()
+        self.alpha = 2.0 / (span + 1)
+
+    def _step(self, state, x):
+        return x if state is None else self.alpha * x + (1 - self.alpha) * state
+
+    def _value(self, state):
+        return np.nan if state is None else state
+
+
+class StreamingRSI(_StreamingIndicator):
+    """
+    與 rsi(close, period) 相同：Wilder 平滑（alpha=1/period）且 pandas 預設 adjust=True，
+    因此保留加權分子的遞迴；avg_gain / avg_loss 的分母相同會互相抵消，只需分子與樣本數。
+    狀態 = (上一根收盤, 漲幅分子, 跌幅分子, 樣本數)
+    """
+    def __init__(self, period: int = 14):
+        super().__init__()
+        self.period = period
+        self.decay = 1 - 1.0 / period
+
+    def _step(self, state, x):
+        if state is None:
+            return (x, 0.0, 0.0, 0)
+        last, num_gain, num_loss, n = state
+        delta = x - last
+        return (x,
+                max(delta, 0.0) + self.decay * num_gain,
+                max(-delta, 0.0) + self.decay * num_loss,
+                n + 1)
+
+    def _value(self, state):
+        if state is None or state[3] < self.period or state[2] == 0:
+            return np.nan
+        return 100 - 100 / (1 + state[1] / state[2])
+
+
+class StreamingMACD:
+    """與 macd(close, fast, slow, signal) 相同，回傳 (macd_line, signal_line, hist)"""
+    def __init__(self, fast: int = 12, slow: int = 26, signal: int = 9):
+        self.fast = StreamingEMA(fast)
+        self.slow = StreamingEMA(slow)
+        self.signal = StreamingEMA(signal)
+
+    @property
+    def value(self):
+        line = self.fast.value - self.slow.value
+        sig = self.signal.value
+        return line, sig, line - sig
+
+    def update(self, x: float):
+        line = self.fast.update(x) - self.slow.update(x)
+        self.signal.update(line)
+        return self.value
+
+    def revise(self, x: float):
+        line = self.fast.revise(x) - self.slow.revise(x)
+        self.signal.revise(line)
+        return self.value
+
+    def seed(self, values):
+        for x in np.asarray(values, dtype=np.float64):
+            self.update(x)
+        return self.value
+
+
+# ==========================================================
+# 🧮 2-D 向量化指標（代號數 × 時間，一次算完整個自選清單）
+# ==========================================================
+# 輸入為 shape (n_symbols, n_bars) 的陣列（所有代號時間對齊、值為有限數），輸出同 shape。
+# 有 scipy 時以 lfilter 沿時間軸做一階遞迴濾波；否則沿時間迴圈、每步對所有代號向量化。
+def _recursive_filter(x: np.ndarray, gain: float, decay: float, init: np.ndarray) -> np.ndarray:
+    """y[t] = gain * x[t] + decay * y[t-1]，y[-1] = init（每個代號一個初值）"""
+    if _HAS_SCIPY:
+        y, _ = lfilter([gain], [1.0, -decay], x, axis=1, zi=(decay * init)[:, None])
+        return y
+    y = np.empty_like(x)
+    prev = init
+    for t in range(x.shape[1]):
+        prev = gain * x[:, t] + decay * prev
+        y[:, t] = prev
+    return y
+
+
+def ema_2d(values, span: int) -> np.ndarray:
+    """與 ema(series, span) 相同（adjust=False），逐列計算"""
+    x = np.atleast_2d(np.asarray(values, dtype=np.float64))
+    if x.shape[1] == 0:
+        return x.copy()
+    alpha = 2.0 / (span + 1)
+    # 初值設為第一根，使 y[0] = x[0]
+    return _recursive_filter(x, alpha, 1 - alpha, x[:, 0])
+
+
+def rsi_2d(close, period: int = 14) -> np.ndarray:
+    """與 rsi(close, period) 相同（Wilder 平滑、adjust=True；分母相同互相抵消只需分子）"""
+    x = np.atleast_2d(np.asarray(close, dtype=np.float64))
+    out = np.full(x.shape, np.nan)
+    if x.shape[1] <= period:
+        return out
+    delta = np.diff(x, axis=1)
+    zero = np.zeros(x.shape[0])
+    decay = 1 - 1.0 / period
+    num_gain = _recursive_filter(np.clip(delta, 0, None), 1.0, decay, zero)
+    num_loss = _recursive_filter(np.clip(-delta, 0, None), 1.0, decay, zero)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rs = num_gain / np.where(num_loss == 0, np.nan, num_loss)
+    out[:, 1:] = 100 - 100 / (1 + rs)
+    # min_periods：前 period 根沒有足夠的樣本
+    out[:, :period] = np.nan
+    return out
+
+
+def macd_2d(close, fast: int = 12, slow: int = 26, signal: int = 9):
+    """與 macd(close, fast, slow, signal) 相同，回傳 (macd_line, signal_line, hist) 三個陣列"""
+    line = ema_2d(close, fast) - ema_2d(close, slow)
+    signal_line = ema_2d(line, signal)
+    return line, signal_line, line - signal_line
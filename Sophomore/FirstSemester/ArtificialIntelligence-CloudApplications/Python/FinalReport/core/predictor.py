@@ -1,19 +1,498 @@
+import os
+import glob
+import json
+import time
+import hashlib
+import threading
+from concurrent.futures import ProcessPoolExecutor, Future
+from collections import OrderedDict
 from datetime import datetime
 import pandas as pd
 import numpy as np
 
+from .cache import _safe_name
+
 # Prophet optional
 _HAS_PROPHET = False
 try:
     from prophet import Prophet
+    from prophet.serialize import model_to_json, model_from_json
     _HAS_PROPHET = True
 except Exception:
     _HAS_PROPHET = False
 
 
+# ==========================================================
+# 🧰 預測後端註冊表
+# ==========================================================
+# 所有後端都在 log 價格上運作：
+#   fit(ds, y, init=None)   ds 為時間索引、y 為 log 收盤價
+#   predict(future)         回傳 (yhat, lower, upper) 三個 log 空間陣列
+#   params()                回傳可用於下次 warm start 的參數（不支援則為 None）
+BACKENDS: dict[str, type] = {}
+
+# 區間寬度 0.5 對應的常態分位數（與 Prophet interval_width=0.5 一致）
+_Z50 = 0.6745
+
+
+def register_backend(name: str):
+    def deco(cls):
+        cls.name = name
+        BACKENDS[name] = cls
+        return cls
+    return deco
+
+
+def available_backends() -> list[str]:
+    return [n for n in BACKENDS if n != "prophet" or _HAS_PROPHET]
+
+
+@register_backend("prophet")
+class ProphetBackend:
+    """完整 Prophet（支援以前次參數 warm start）"""
+    def fit(self, ds, y, init=None):
+        hist = pd.DataFrame({"ds": ds, "y": y})
+        self.m = self._build()
+        try:
+            self.m.fit(hist, init=init) if init is not None else self.m.fit(hist)
+        except Exception:
+            # 參數形狀不合（例如資料太少導致 changepoint 數改變）時退回冷啟動
+            if init is None:
+                raise
+            self.m = self._build()
+            self.m.fit(hist)
+        return self
+
+    @staticmethod
+    def _build():
+        return Prophet(
+            seasonality_mode="additive",
+            daily_seasonality=True,
+            weekly_seasonality=True,
+            yearly_seasonality=False,
+            changepoint_prior_scale=0.5,
+            n_changepoints=80,
+            interval_width=0.5
+        )
+
+    def predict(self, future):
+        fcst = self.m.predict(pd.DataFrame({"ds": future}))
+        return fcst["yhat"].to_numpy(), fcst["yhat_lower"].to_numpy(), fcst["yhat_upper"].to_numpy()
+
+    def params(self) -> dict:
+        """取出擬合後的 k, m, sigma_obs, delta, beta（Prophet 官方 warm start 作法）"""
+        res = {name: float(self.m.params[name][0][0]) for name in ("k", "m", "sigma_obs")}
+        for name in ("delta", "beta"):
+            res[name] = self.m.params[name][0]
+        return res
+
+
+@register_backend("holt_winters")
+class HoltWintersBackend:
+    """
+    加法 Holt-Winters（阻尼趨勢，season=0 時即 Holt 線性趨勢）。
+    平滑係數以網格搜尋一步預測誤差決定：所有候選組合同時以陣列遞迴，一次掃過資料。
+    """
+    GRID = np.array([0.05, 0.1, 0.2, 0.4, 0.6, 0.8])
+
+    def __init__(self, season: int = 0, phi: float = 0.98):
+        self.season = season
+        self.phi = phi
+
+    def fit(self, ds, y, init=None):
+        y = np.asarray(y, dtype=np.float64)
+        a, b = np.meshgrid(self.GRID, self.GRID[:4], indexing="ij")
+        a, b = a.ravel(), b.ravel()
+        m = self.season if self.season and len(y) > 2 * self.season else 0
+        level = np.full(a.shape, y[0])
+        trend = np.full(a.shape, (y[min(len(y) - 1, 10)] - y[0]) / min(len(y) - 1, 10) if len(y) > 1 else 0.0)
+        seas = np.tile(y[:m] - y[:m].mean(), (len(a), 1)) if m else None
+        sse = np.zeros(a.shape)
+        for t in range(1, len(y)):
+            s_t = seas[:, t % m] if m else 0.0
+            pred = level + self.phi * trend + s_t
+            err = y[t] - pred
+            sse += err * err
+            new_level = level + self.phi * trend + a * err
+            trend = self.phi * trend + a * b * err
+            if m:
+                seas[:, t % m] = s_t + 0.1 * (1 - a) * err
+            level = new_level
+        best = int(np.argmin(sse))
+        self.level, self.trend = level[best], trend[best]
+        self.seas = seas[best] if m else None
+        self.m_season, self.n = m, len(y)
+        self.sigma = float(np.sqrt(sse[best] / max(len(y) - 1, 1)))
+        return self
+
+    def predict(self, future):
+        h = np.arange(1, len(future) + 1)
+        damp = np.cumsum(self.phi ** h)
+        yhat = self.level + damp * self.trend
+        if self.m_season:
+            yhat = yhat + self.seas[(self.n - 1 + h) % self.m_season]
+        band = _Z50 * self.sigma * np.sqrt(h)
+        return yhat, yhat - band, yhat + band
+
+    def params(self):
+        return None
+
+
+@register_backend("ar")
+class ARBackend:
+    """報酬率上的 AR(p)，以最小平方法一次解出係數；預測時累加回 log 價格"""
+    def __init__(self, p: int = 8):
+        self.p = p
+
+    def fit(self, ds, y, init=None):
+        y = np.asarray(y, dtype=np.float64)
+        r = np.diff(y)
+        p = min(self.p, max(1, len(r) // 4))
+        lags = np.lib.stride_tricks.sliding_window_view(r, p)[:-1][:, ::-1]
+        X = np.column_stack([np.ones(len(lags)), lags])
+        target = r[p:]
+        coef, *_ = np.linalg.lstsq(X, target, rcond=None)
+        self.c, self.phi = coef[0], coef[1:]
+        self.sigma = float(np.std(target - X @ coef))
+        self.last_y = y[-1]
+        self.hist = r[-p:][::-1].copy()
+        return self
+
+    def predict(self, future):
+        hist = list(self.hist)
+        out = []
+        for _ in range(len(future)):
+            nxt = self.c + float(np.dot(self.phi, hist[:len(self.phi)]))
+            out.append(nxt)
+            hist.insert(0, nxt)
+        h = np.arange(1, len(future) + 1)
+        yhat = self.last_y + np.cumsum(out)
+        band = _Z50 * self.sigma * np.sqrt(h)
+        return yhat, yhat - band, yhat + band
+
+    def params(self):
+        return None
+
+
+@register_backend("kalman")
+class KalmanLevelBackend:
+    """
+    Kalman local-level 模型：雜訊變異以差分的動差估計，
+    穩態增益下濾波等同 EWMA，直接用 pandas 向量化計算。
+    """
+    def fit(self, ds, y, init=None):
+        y = np.asarray(y, dtype=np.float64)
+        d = np.diff(y)
+        acov1 = float(np.mean((d[1:] - d.mean()) * (d[:-1] - d.mean()))) if len(d) > 2 else 0.0
+        self.r = max(-acov1, 1e-12)
+        self.q = max(float(np.var(d)) - 2 * self.r, 1e-12) if len(d) > 1 else 1e-12
+        # 穩態事前變異 P 滿足 P = P - P²/(P + r) + q
+        P = (self.q + np.sqrt(self.q ** 2 + 4 * self.q * self.r)) / 2
+        self.P = P * self.r / (P + self.r)
+        gain = P / (P + self.r)
+        self.level = float(pd.Series(y).ewm(alpha=gain, adjust=False).mean().iloc[-1])
+        return self
+
+    def predict(self, future):
+        h = np.arange(1, len(future) + 1)
+        yhat = np.full(len(future), self.level)
+        band = _Z50 * np.sqrt(self.P + h * self.q + self.r)
+        return yhat, yhat - band, yhat + band
+
+    def params(self):
+        return None
+
+
+@register_backend("mean")
+class MeanBackend:
+    """最近 20 根平均，±2% 區間（原本的 fallback）"""
+    def fit(self, ds, y, init=None):
+        self.level = float(np.log(np.mean(np.exp(np.asarray(y)[-20:]))))
+        return self
+
+    def predict(self, future):
+        yhat = np.full(len(future), self.level)
+        return yhat, yhat + np.log(0.98), yhat + np.log(1.02)
+
+    def params(self):
+        return None
+
+
+# ==========================================================
+# 💾 模型持久化（重新啟動後不必再從頭擬合）
+# ==========================================================
+# 預設模型目錄（FinalReport/cache/models）
+DEFAULT_MODEL_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "cache", "models"
+)
+
+
+def _dump_model(model) -> dict:
+    """Prophet 用官方 JSON 序列化；其餘 numpy 後端直接存屬性（陣列轉 list）"""
+    if isinstance(model, ProphetBackend):
+        return {"prophet": model_to_json(model.m)}
+    state = {}
+    for k, v in vars(model).items():
+        if isinstance(v, np.ndarray):
+            state[k] = {"ndarray": v.tolist()}
+        elif isinstance(v, np.generic):
+            state[k] = v.item()
+        else:
+            state[k] = v
+    return {"state": state}
+
+
+def _load_model(name: str, payload: dict):
+    model = BACKENDS[name].__new__(BACKENDS[name])
+    if "prophet" in payload:
+        model.m = model_from_json(payload["prophet"])
+        return model
+    for k, v in payload["state"].items():
+        setattr(model, k, np.asarray(v["ndarray"]) if isinstance(v, dict) and "ndarray" in v else v)
+    return model
+
+
+class ModelStore:
+    """
+    已擬合模型的本地儲存區：
+    - 一個模型一個 JSON 檔：<symbol>__<tf>__<backend>__<fingerprint>.json
+    - fingerprint 為訓練資料的雜湊，資料完全相同時可直接拿來 predict
+    - 同一個 (symbol, tf, backend) 只保留最新版本；資料已更新時舊模型仍可作為 warm start 起點
+    - 超過 max_age 秒或總大小超過 max_bytes 時由舊到新刪除
+    """
+
+    def __init__(self, root: str | None = None, max_bytes: int = 200 * 1024 * 1024,
+                 max_age: float = 7 * 86400):
+        self.root = root or DEFAULT_MODEL_DIR
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def fingerprint(ds, y) -> str:
+        h = hashlib.blake2b(digest_size=8)
+        h.update(np.ascontiguousarray(y, dtype=np.float64).tobytes())
+        if len(ds):
+            h.update(f"{pd.Timestamp(ds[0])}|{pd.Timestamp(ds[-1])}".encode())
+        return h.hexdigest()
+
+    def _prefix(self, symbol: str, tf: str, backend: str) -> str:
+        return os.path.join(self.root, f"{_safe_name(symbol or '_')}__{_safe_name(tf)}__{backend}__")
+
+    def _files(self, prefix: str = "") -> list[str]:
+        return glob.glob((prefix or os.path.join(self.root, "")) + "*.json")
+
+    def load(self, symbol: str, tf: str, backend: str, fp: str | None = None):
+        """
+        回傳 (模型, fingerprint)；fp=None 時取該 key 最新的版本（warm start 用）。
+        找不到或檔案損毀回傳 None。
+        """
+        prefix = self._prefix(symbol, tf, backend)
+        if fp is not None:
+            files = [prefix + f"{fp}.json"]
+        else:
+            files = sorted(self._files(prefix), key=os.path.getmtime, reverse=True)
+        for path in files:
+            if not os.path.exists(path):
+                continue
+            if time.time() - os.path.getmtime(path) > self.max_age:
+                continue
+            try:
+                with open(path, encoding="utf-8") as f:
+                    payload = json.load(f)
+                model = _load_model(backend, payload["model"])
+                if fp is not None:
+                    self.hits += 1
+                return model, payload["fingerprint"]
+            except Exception as e:
+                print(f"[ModelStore] load failed {os.path.basename(path)}: {e}")
+        if fp is not None:
+            self.misses += 1
+        return None
+
+    def save(self, symbol: str, tf: str, backend: str, fp: str, model):
+        prefix = self._prefix(symbol, tf, backend)
+        path = prefix + f"{fp}.json"
+        try:
+            os.makedirs(self.root, exist_ok=True)
+            payload = {"backend": backend, "symbol": symbol, "tf": tf, "fingerprint": fp,
+                       "saved_at": time.time(), "model": _dump_model(model)}
+            tmp = path + f".{os.getpid()}.tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(payload, f)
+            os.replace(tmp, path)
+            for old in self._files(prefix):
+                if old != path:
+                    self._remove(old)
+        except Exception as e:
+            print(f"[ModelStore] save failed: {e}")
+            return
+        self.evict()
+
+    def evict(self):
+        """刪除過期模型，再依修改時間由舊到新刪到總大小低於 max_bytes"""
+        entries = []
+        for path in self._files():
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            if time.time() - st.st_mtime > self.max_age:
+                self._remove(path)
+            else:
+                entries.append((st.st_mtime, st.st_size, path))
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            self._remove(path)
+            total -= size
+
+    @staticmethod
+    def _remove(path: str):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
 class Predictor:
-    def __init__(self):
+    # auto 模式的偏好順序（越前面越精細、也越慢）
+    AUTO_ORDER = ("prophet", "holt_winters", "ar", "kalman", "mean")
+
+    def __init__(self, model_ttl: float = 600.0, max_models: int = 32,
+                 warm_start: bool = True, max_history: int = 1000,
+                 backend: str = "prophet", backend_by_tf: dict | None = None,
+                 latency_budget: float = 0.5, max_horizon: int = 100,
+                 persist: bool = False, model_dir: str | None = None, reprobe_after: float = 600.0):
         self.use_prophet = _HAS_PROPHET
+        self.max_history = max_history
+        self.max_horizon = max_horizon      # 每個模型版本一次預測的最大根數
+        # 後端選擇：backend_by_tf 優先，否則 backend；"auto" 依實測擬合時間挑選
+        self.backend = backend
+        self.backend_by_tf = backend_by_tf or {}
+        self.latency_budget = latency_budget
+        self.fit_times: dict[str, float] = {}      # 後端 → 擬合時間（秒，指數平均）
+        self._fit_measured_at: dict[str, float] = {}
+        # 超過預算的量測在 reprobe_after 秒後視為過期，auto 會再試一次（例如 warm start 後 Prophet 變快）
+        self.reprobe_after = reprobe_after
+        # warm start：(symbol, tf) → 上一次擬合的參數，作為下一次 Stan 最佳化的起點
+        self.warm_start = warm_start
+        self._warm_params: dict[tuple, dict] = {}
+        # 已訓練模型快取：(symbol, tf, 最後一根已收盤 K 線時間) → (模型, 訓練時間)
+        self.model_ttl = model_ttl
+        self.max_models = max_models
+        self._models: OrderedDict = OrderedDict()
+        self._models_lock = threading.Lock()
+        # 磁碟模型儲存區：記憶體快取 miss 時才去讀（延遲載入）
+        self.store = ModelStore(model_dir) if persist else None
+
+    # ==========================================================
+    # 🗃️ 模型快取
+    # ==========================================================
+    def _model_key(self, df: pd.DataFrame, tf: str, symbol: str) -> tuple:
+        """最後一根 K 線仍在形成中，以倒數第二根（最後一根已收盤）作為版本"""
+        closed_ts = df.index[-2] if len(df) > 1 else df.index[-1]
+        return (symbol, tf, pd.Timestamp(closed_ts))
+
+    def _get_model(self, key: tuple):
+        with self._models_lock:
+            hit = self._models.get(key)
+            if hit is None:
+                return None
+            model, fitted_at, _ = hit
+            if time.monotonic() - fitted_at > self.model_ttl:
+                del self._models[key]
+                return None
+            self._models.move_to_end(key)
+            return model
+
+    def _put_model(self, key: tuple, model):
+        with self._models_lock:
+            # 同一個 (symbol, tf) 只保留最新版本
+            for old in [k for k in self._models if k[:2] == key[:2]]:
+                del self._models[old]
+            # [模型, 訓練時間, 此版本模型算到 max_horizon 的預測]
+            self._models[key] = [model, time.monotonic(), None]
+            while len(self._models) > self.max_models:
+                self._models.popitem(last=False)
+
+    def _cached_forecast(self, key: tuple, start: pd.Timestamp, steps: int) -> pd.DataFrame | None:
+        """同一模型版本、同一起點且根數足夠時，直接切片，不必再 predict"""
+        with self._models_lock:
+            hit = self._models.get(key)
+            fcst = hit[2] if hit is not None else None
+        if fcst is None or len(fcst) < steps or fcst.index[0] != start:
+            return None
+        return fcst.iloc[:steps]
+
+    def _store_forecast(self, key: tuple, fcst: pd.DataFrame):
+        with self._models_lock:
+            hit = self._models.get(key)
+            if hit is not None:
+                hit[2] = fcst
+
+    # ==========================================================
+    # 🔥 後端選擇 / 擬合（含 warm start 與擬合時間量測）
+    # ==========================================================
+    def choose_backend(self, tf: str, backend: str | None = None) -> str:
+        name = backend or self.backend_by_tf.get(tf, self.backend)
+        avail = [n for n in available_backends() if n != "prophet" or self.use_prophet]
+        if name != "auto":
+            return name if name in avail else "holt_winters"
+        # auto：依偏好順序挑第一個「實測擬合時間在預算內」的後端（尚未量測或量測已過期的先試一次）
+        now = time.monotonic()
+        for cand in self.AUTO_ORDER:
+            if cand not in avail:
+                continue
+            stale = now - self._fit_measured_at.get(cand, now) > self.reprobe_after
+            if stale or self.fit_times.get(cand, 0.0) <= self.latency_budget:
+                return cand
+        return "mean"
+
+    def _record_fit_time(self, name: str, elapsed: float):
+        prev = self.fit_times.get(name)
+        stale = time.monotonic() - self._fit_measured_at.get(name, time.monotonic()) > self.reprobe_after
+        # 過期的舊量測不再參與平均，重新試跑的結果直接取代
+        self.fit_times[name] = elapsed if prev is None or stale else 0.7 * prev + 0.3 * elapsed
+        self._fit_measured_at[name] = time.monotonic()
+
+    def _fit_backend(self, name: str, ds, y, warm_key: tuple | None = None):
+        init = self._warm_params.get((name,) + warm_key) if self.warm_start and warm_key else None
+        t = time.perf_counter()
+        model = BACKENDS[name]().fit(ds, y, init=init)
+        self._record_fit_time(name, time.perf_counter() - t)
+        params = model.params()
+        if warm_key is not None and params is not None:
+            self._warm_params[(name,) + warm_key] = params
+        return model
+
+    def _load_or_fit(self, name: str, ds, y, symbol: str, tf: str):
+        """
+        先查磁碟：資料 fingerprint 相同 → 直接沿用已存模型；
+        否則以該 key 最新的已存模型參數作為 warm start 起點再擬合，並寫回磁碟。
+        """
+        if self.store is None:
+            return self._fit_backend(name, ds, y, warm_key=(symbol, tf))
+        fp = self.store.fingerprint(ds, y)
+        hit = self.store.load(symbol, tf, name, fp)
+        if hit is not None:
+            return hit[0]
+        warm = (name, symbol, tf)
+        if self.warm_start and warm not in self._warm_params:
+            latest = self.store.load(symbol, tf, name)
+            if latest is not None:
+                params = latest[0].params()
+                if params is not None:
+                    self._warm_params[warm] = params
+        m = self._fit_backend(name, ds, y, warm_key=(symbol, tf))
+        self.store.save(symbol, tf, name, fp, m)
+        return m
+
+    def _fit_prophet(self, hist: pd.DataFrame, warm_key: tuple | None = None):
+        """以 Prophet 後端擬合 (ds, y) DataFrame（benchmark 用）"""
+        return self._fit_backend("prophet", hist["ds"], hist["y"].to_numpy(), warm_key).m
 
     # ==========================================================
     # 🧩 Timeframe 解析
@@ -35,65 +514,80 @@ class Predictor:
                 return unit_name, val, f"{val}{pd_code}"
         return "min", 1, "1min"
 
+    # ==========================================================
+    # 🧪 前處理 / 後處理（forecast 與 forecast_many 共用）
+    # ==========================================================
+    def _prepare(self, df: pd.DataFrame):
+        """只用已收盤 K 線；log 平滑後回傳 (時間索引, log 收盤價)"""
+        closed = df.iloc[:-1] if len(df) > 1 else df
+        close = closed["Close"].tail(self.max_history)
+        y = np.log(close.replace(0, np.nan)).ffill().bfill().to_numpy()
+        return close.index, y
+
+    @staticmethod
+    def _to_frame(future, yhat, lower, upper) -> pd.DataFrame:
+        return pd.DataFrame({
+            "yhat": np.exp(yhat),
+            "yhat_lower": np.exp(lower),
+            "yhat_upper": np.exp(upper)
+        }, index=future)
+
+    @staticmethod
+    def _clamp(fcst: pd.DataFrame, df: pd.DataFrame) -> pd.DataFrame:
+        """智能波動範圍限制"""
+        last_price = df["Close"].iloc[-1]
+        vol = np.std(df["Close"].pct_change().dropna()) * 100
+        clamp = max(0.05, min(0.25, vol / 5))
+
+        fcst["yhat"] = np.clip(fcst["yhat"], last_price * (1 - clamp), last_price * (1 + clamp))
+        fcst["yhat_lower"] = np.clip(fcst["yhat_lower"], last_price * (1 - clamp * 1.5), last_price * (1 + clamp))
+        fcst["yhat_upper"] = np.clip(fcst["yhat_upper"], last_price * (1 - clamp), last_price * (1 + clamp * 1.5))
+        return fcst[["yhat", "yhat_lower", "yhat_upper"]]
+
     # ==========================================================
     # 🔮 AI 預測主邏輯（含預測區間）
     # ==========================================================
-    def forecast(self, df: pd.DataFrame, steps: int = 5, tf: str = "1m") -> pd.DataFrame:
+    def forecast(self, df: pd.DataFrame, steps: int = 5, tf: str = "1m", symbol: str = "",
+                 backend: str | None = None) -> pd.DataFrame:
         if df is None or df.empty:
             return pd.DataFrame(columns=["yhat", "yhat_lower", "yhat_upper"])
 
         unit_name, val, pandas_freq = self._parse_tf(tf)
-        print(f"[Predictor] Timeframe={tf} → unit={unit_name}, step={val}, pandas_freq={pandas_freq}")
+        name = self.choose_backend(tf, backend)
+        print(f"[Predictor] Timeframe={tf} → unit={unit_name}, step={val}, pandas_freq={pandas_freq}, backend={name}")
 
         # ======================================================
-        # ✅ Prophet 模型預測
+        # ✅ 後端模型預測
         # ======================================================
-        if self.use_prophet:
-            try:
-                hist = df[["Close"]].copy().reset_index()
-                hist.columns = ["ds", "y"]
-                hist = hist.tail(1000)
-
-                # log 平滑
-                hist["y"] = np.log(hist["y"].replace(0, np.nan)).fillna(method="ffill")
-
-                is_short_tf = any(tf.endswith(x) for x in ["s", "m"])
-                m = Prophet(
-                    seasonality_mode="additive",
-                    daily_seasonality=True,
-                    weekly_seasonality=True,
-                    yearly_seasonality=False,
-                    changepoint_prior_scale=0.5,
-                    n_changepoints=80,
-                    interval_width=0.5
-                )
-                m.fit(hist)
-
-                last_ts = df.index[-1]
-                future_start = last_ts + pd.Timedelta(val, unit=unit_name)
-                future = pd.date_range(start=future_start, periods=steps, freq=pandas_freq)
-                future_df = pd.DataFrame({"ds": future})
-
-                fcst = m.predict(future_df)[["ds", "yhat", "yhat_lower", "yhat_upper"]]
-                fcst[["yhat", "yhat_lower", "yhat_upper"]] = np.exp(fcst[["yhat", "yhat_lower", "yhat_upper"]])
-                fcst = fcst.set_index("ds")
-
-                # 智能波動範圍限制
-                last_price = df["Close"].iloc[-1]
-                vol = np.std(df["Close"].pct_change().dropna()) * 100
-                clamp = max(0.05, min(0.25, vol / 5))
-
-                fcst["yhat"] = np.clip(fcst["yhat"], last_price * (1 - clamp), last_price * (1 + clamp))
-                fcst["yhat_lower"] = np.clip(fcst["yhat_lower"], last_price * (1 - clamp * 1.5), last_price * (1 + clamp))
-                fcst["yhat_upper"] = np.clip(fcst["yhat_upper"], last_price * (1 - clamp), last_price * (1 + clamp * 1.5))
-
-                return fcst[["yhat", "yhat_lower", "yhat_upper"]]
-            except Exception as e:
-                print(f"[Predictor] Prophet failed: {e}")
+        try:
+            # 只有新 K 線收盤或模型過期才重新訓練，否則沿用快取模型只做 predict
+            key = self._model_key(df, tf, symbol) + (name,)
+            m = self._get_model(key)
+            if m is None:
+                ds, y = self._prepare(df)
+                m = self._load_or_fit(name, ds, y, symbol, tf)
+                self._put_model(key, m)
+
+            future_start = df.index[-1] + pd.Timedelta(val, unit=unit_name)
+
+            # 每個模型版本只 predict 一次到 max_horizon，較短的預測範圍直接切片
+            fcst = self._cached_forecast(key, future_start, steps)
+            if fcst is None:
+                future = pd.date_range(start=future_start, periods=max(steps, self.max_horizon), freq=pandas_freq)
+                fcst = self._to_frame(future, *m.predict(future))
+                self._store_forecast(key, fcst)
+                fcst = fcst.iloc[:steps]
+            return self._clamp(fcst.copy(), df)
+        except Exception as e:
+            print(f"[Predictor] {name} failed: {e}")
 
         # ======================================================
         # ⚙️ fallback：均線外推
         # ======================================================
+        return self._fallback(df, steps, tf)
+
+    def _fallback(self, df: pd.DataFrame, steps: int, tf: str) -> pd.DataFrame:
+        unit_name, val, pandas_freq = self._parse_tf(tf)
         tail = df["Close"].tail(20)
         y = float(tail.mean()) if len(tail) else float(df["Close"].iloc[-1])
         last_ts = df.index[-1] if len(df) else datetime.now()
@@ -103,3 +597,177 @@ class Predictor:
             "yhat_lower": [y * 0.98] * steps,
             "yhat_upper": [y * 1.02] * steps
         }, index=idx)
+
+    # ==========================================================
+    # 📦 多標的批次預測（整個自選清單一次分散到所有核心）
+    # ==========================================================
+    def forecast_many(self, frames: dict[str, pd.DataFrame], steps: int = 5, tf: str = "1m",
+                      backend: str | None = None, workers: int | None = None) -> pd.DataFrame:
+        """
+        frames：{symbol: OHLCV DataFrame}。
+        前處理（log、ffill、clamp 統計）在主程序做一次，只把 (ds, y) 送進程序池擬合；
+        記憶體 / 磁碟快取命中的標的不會送出。
+        回傳以 (symbol, ds) 為 MultiIndex 的單一 DataFrame。
+        """
+        name = self.choose_backend(tf, backend)
+        unit_name, val, pandas_freq = self._parse_tf(tf)
+        horizon = max(steps, self.max_horizon)
+        out: dict[str, pd.DataFrame] = {}
+        jobs = {}
+
+        for symbol, df in frames.items():
+            if df is None or df.empty:
+                continue
+            key = self._model_key(df, tf, symbol) + (name,)
+            future = pd.date_range(start=df.index[-1] + pd.Timedelta(val, unit=unit_name),
+                                   periods=horizon, freq=pandas_freq)
+            fcst = self._cached_forecast(key, future[0], steps)
+            if fcst is not None:
+                out[symbol] = fcst
+                continue
+            m = self._get_model(key)
+            ds, y = self._prepare(df)
+            fp = None
+            if m is None and self.store is not None:
+                fp = self.store.fingerprint(ds, y)
+                hit = self.store.load(symbol, tf, name, fp)
+                if hit is not None:
+                    m = hit[0]
+                    self._put_model(key, m)
+            if m is not None:
+                out[symbol] = self._to_frame(future, *m.predict(future))
+                self._store_forecast(key, out[symbol])
+                continue
+            init = self._warm_params.get((name, symbol, tf)) if self.warm_start else None
+            jobs[symbol] = (key, fp, future, (name, ds, y, future, init))
+
+        if jobs:
+            n = workers or min(len(jobs), os.cpu_count() or 1)
+            with ProcessPoolExecutor(max_workers=n) as ex:
+                futs = {sym: ex.submit(_worker_fit_predict, *job[3]) for sym, job in jobs.items()}
+                for symbol, fut in futs.items():
+                    key, fp, future, _ = jobs[symbol]
+                    try:
+                        m, pred, elapsed = fut.result()
+                    except Exception as e:
+                        print(f"[Predictor] {name} failed for {symbol}: {e}")
+                        continue
+                    self._record_fit_time(name, elapsed)
+                    params = m.params()
+                    if params is not None:
+                        self._warm_params[(name, symbol, tf)] = params
+                    if self.store is not None:
+                        self.store.save(symbol, tf, name, fp, m)
+                    self._put_model(key, m)
+                    out[symbol] = self._to_frame(future, *pred)
+                    self._store_forecast(key, out[symbol])
+
+        parts = {}
+        for symbol, df in frames.items():
+            if df is None or df.empty:
+                continue
+            fcst = out.get(symbol)
+            parts[symbol] = self._clamp(fcst.iloc[:steps].copy(), df) if fcst is not None \
+                else self._fallback(df, steps, tf)
+        if not parts:
+            return pd.DataFrame(columns=["yhat", "yhat_lower", "yhat_upper"])
+        return pd.concat(parts, names=["symbol", "ds"])
+
+
+def _worker_fit_predict(name: str, ds, y, future, init):
+    """程序池 worker：擬合 + 預測到 max_horizon，回傳 (模型, (yhat, lower, upper), 擬合秒數)"""
+    t = time.perf_counter()
+    model = BACKENDS[name]().fit(ds, y, init=init)
+    elapsed = time.perf_counter() - t
+    return model, model.predict(future), elapsed
+
+
+# ==========================================================
+# 🧵 背景程序池預測（GUI 不再被模型訓練卡住）
+# ==========================================================
+_worker_predictor = None
+
+
+def _worker_forecast(df: pd.DataFrame, steps: int, tf: str, symbol: str, backend: str | None,
+                     predictor_kwargs: dict) -> pd.DataFrame:
+    """在 worker 程序中執行；每個程序有自己的 Predictor（含模型快取）"""
+    global _worker_predictor
+    if _worker_predictor is None:
+        _worker_predictor = Predictor(**predictor_kwargs)
+    return _worker_predictor.forecast(df, steps=steps, tf=tf, symbol=symbol, backend=backend)
+
+
+class ForecastPool:
+    """
+    以程序池執行 Predictor.forecast：
+    - submit() 回傳 Future；同一個 (symbol, tf) 同時最多一個執行中 + 一個等待中，
+      等待中的請求被更新的請求取代（舊的直接丟棄）
+    - 依 (symbol, tf) 固定分派到同一個 worker，讓 worker 內的模型快取保持有效
+    - poll() 非阻塞取回最新完成的結果，給 GUI 用 root.after 輪詢
+    """
+
+    def __init__(self, workers: int | None = None, predictor_kwargs: dict | None = None):
+        n = workers or max(1, min(4, (os.cpu_count() or 2) - 1))
+        self._shards = [ProcessPoolExecutor(max_workers=1) for _ in range(n)]
+        self.predictor_kwargs = predictor_kwargs or {}
+        self._lock = threading.RLock()
+        self._running: dict[tuple, object] = {}     # key → 執行中的 Future
+        self._pending: dict[tuple, tuple] = {}      # key → 等待中的 (args, Future)
+        self._results: dict[tuple, pd.DataFrame] = {}
+        self.dropped = 0
+
+    def _shard(self, key: tuple) -> ProcessPoolExecutor:
+        return self._shards[hash(key) % len(self._shards)]
+
+    def submit(self, df: pd.DataFrame, steps: int, tf: str, symbol: str = "", backend: str | None = None):
+        key = (symbol, tf)
+        args = (df.copy(), steps, tf, symbol, backend)
+        with self._lock:
+            if key in self._running:
+                old = self._pending.pop(key, None)
+                if old is not None:
+                    old[1].cancel()
+                    self.dropped += 1
+                outer = Future()
+                self._pending[key] = (args, outer)
+                return outer
+            return self._start(key, args)
+
+    def _start(self, key: tuple, args: tuple, outer=None):
+        """送進 worker；呼叫端需持有 _lock"""
+        inner = self._shard(key).submit(_worker_forecast, *args, self.predictor_kwargs)
+        self._running[key] = inner
+        inner.add_done_callback(lambda f: self._on_done(key, f, outer))
+        return inner if outer is None else outer
+
+    def _on_done(self, key: tuple, fut, outer):
+        try:
+            result = fut.result()
+        except Exception as e:
+            print(f"[ForecastPool] forecast failed: {e}")
+            result = None
+        with self._lock:
+            self._running.pop(key, None)
+            if result is not None:
+                self._results[key] = result
+            if outer is not None and outer.set_running_or_notify_cancel():
+                if result is not None:
+                    outer.set_result(result)
+                else:
+                    outer.set_exception(RuntimeError("forecast failed"))
+            nxt = self._pending.pop(key, None)
+            if nxt is not None:
+                self._start(key, *nxt)
+
+    def poll(self, symbol: str, tf: str) -> pd.DataFrame | None:
+        """取出 (symbol, tf) 最新完成的預測；沒有新結果回傳 None"""
+        with self._lock:
+            return self._results.pop((symbol, tf), None)
+
+    def shutdown(self):
+        with self._lock:
+            for _, fut in self._pending.values():
+                fut.cancel()
+            self._pending.clear()
+        for ex in self._shards:
+            ex.shutdown(wait=False, cancel_futures=True)
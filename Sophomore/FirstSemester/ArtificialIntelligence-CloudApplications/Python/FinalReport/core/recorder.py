@@ -0,0 +1,128 @@
+import os
+import time
+import queue
+import threading
+from datetime import datetime, timezone
+import numpy as np
+import pandas as pd
+
+from .cache import OHLCVCache, _safe_name
+from .stream import Tick
+
+# ---------------------------------------------
+# 預設錄製目錄（FinalReport/recordings）
+# ---------------------------------------------
+DEFAULT_RECORD_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "recordings"
+)
+
+
+class TickRecorder:
+    """
+    背景錄製器：把即時 tick 與收盤 K 線存下來供重播 / 回測使用。
+    - GUI 執行緒只做 queue.put_nowait，不會等磁碟
+    - tick 依 (代號, UTC 日期) 分區，累積 batch_size 筆或 flush_interval 秒寫一個 .npz 區段
+      recordings/ticks/<symbol>/<YYYY-MM-DD>/part-<n>.npz（ts / price / volume 三欄）
+    - 收盤 K 線寫入 OHLCVCache 的 source="live"（供重播 / 回測使用）。
+      刻意不併入 DataFetcher 讀取的 ccxt / yfinance 快取：tick 聚合的 K 線成交量與高低點
+      都不完整，寫進去會蓋掉交易所的 K 線，之後的增量抓取也不會再修正
+    """
+
+    def __init__(self, root: str | None = None, cache: OHLCVCache | None = None,
+                 batch_size: int = 1000, flush_interval: float = 5.0, max_queue: int = 100_000):
+        self.root = root or DEFAULT_RECORD_DIR
+        self.cache = cache or OHLCVCache()
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._buffers: dict[tuple[str, str], list] = {}
+        self._seq: dict[tuple[str, str], int] = {}
+        self._stop = threading.Event()
+        self._thread = None
+        self.stats = {"ticks": 0, "bars": 0, "files": 0, "dropped": 0}
+
+    # -----------------------------------------
+    # 生命週期
+    # -----------------------------------------
+    def start(self):
+        if self._thread is None:
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout: float = 5.0):
+        """停止並把緩衝區全部寫出"""
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join(timeout)
+            self._thread = None
+
+    # -----------------------------------------
+    # 非阻塞寫入介面
+    # -----------------------------------------
+    def record_tick(self, tick: Tick):
+        self._put(("tick", tick))
+
+    def record_bars(self, symbol: str, tf: str, df: pd.DataFrame):
+        if df is not None and not df.empty:
+            self._put(("bars", (symbol, tf, df.copy())))
+
+    def _put(self, item):
+        try:
+            self._queue.put_nowait(item)
+        except queue.Full:
+            self.stats["dropped"] += 1
+
+    # -----------------------------------------
+    # 背景執行緒
+    # -----------------------------------------
+    def _run(self):
+        last_flush = time.monotonic()
+        while not (self._stop.is_set() and self._queue.empty()):
+            try:
+                kind, payload = self._queue.get(timeout=0.5)
+            except queue.Empty:
+                kind = None
+            if kind == "tick":
+                day = datetime.fromtimestamp(payload.ts, tz=timezone.utc).strftime("%Y-%m-%d")
+                key = (payload.symbol, day)
+                buf = self._buffers.setdefault(key, [])
+                buf.append((payload.ts, payload.price, payload.volume))
+                if len(buf) >= self.batch_size:
+                    self._flush(key)
+            elif kind == "bars":
+                symbol, tf, df = payload
+                try:
+                    self.cache.merge("live", symbol, tf, df)
+                    self.stats["bars"] += len(df)
+                except Exception as e:
+                    print(f"[TickRecorder] bar write failed: {e}")
+            if time.monotonic() - last_flush >= self.flush_interval:
+                self.flush_all()
+                last_flush = time.monotonic()
+        self.flush_all()
+
+    def flush_all(self):
+        for key in list(self._buffers):
+            self._flush(key)
+
+    def _flush(self, key: tuple[str, str]):
+        buf = self._buffers.pop(key, None)
+        if not buf:
+            return
+        symbol, day = key
+        arr = np.asarray(buf, dtype=np.float64)
+        path = os.path.join(self.root, "ticks", _safe_name(symbol), day)
+        try:
+            os.makedirs(path, exist_ok=True)
+            seq = self._seq.get(key)
+            if seq is None:
+                seq = len([f for f in os.listdir(path) if f.startswith("part-")])
+            tmp = os.path.join(path, f".part-{seq:06d}.tmp.npz")
+            np.savez(tmp, ts=(arr[:, 0] * 1e9).astype(np.int64), price=arr[:, 1], volume=arr[:, 2])
+            os.replace(tmp, os.path.join(path, f"part-{seq:06d}.npz"))
+            self._seq[key] = seq + 1
+            self.stats["ticks"] += len(arr)
+            self.stats["files"] += 1
+        except Exception as e:
+            print(f"[TickRecorder] tick write failed: {e}")
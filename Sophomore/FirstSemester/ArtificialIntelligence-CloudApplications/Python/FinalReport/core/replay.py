@@ -0,0 +1,210 @@
+import os
+import glob
+import time
+import threading
+from collections import deque
+import numpy as np
+import pandas as pd
+
+from .data_fetcher import DataFetcher, FetchResult
+from .resample import resample_ohlcv
+from .stream import Tick, Transport, _sleep_until
+from .utils import tf_seconds
+
+
+# ---------------------------------------------
+# 讀取錄製檔
+# ---------------------------------------------
+def _normalize(df: pd.DataFrame) -> pd.DataFrame:
+    """統一成 OHLCV 欄位；tick 檔（只有 price/volume）轉成 Open=High=Low=Close=price"""
+    df = df.rename(columns=lambda c: str(c).strip().title())
+    if "Close" not in df.columns and "Price" in df.columns:
+        df["Close"] = df["Price"]
+    for col in ("Open", "High", "Low"):
+        if col not in df.columns:
+            df[col] = df["Close"]
+    if "Volume" not in df.columns:
+        df["Volume"] = 0.0
+    df = df[["Open", "High", "Low", "Close", "Volume"]].astype(np.float64)
+    df.index = pd.DatetimeIndex(df.index).as_unit("ns")
+    df = df[~df.index.duplicated(keep="last")].sort_index()
+    df.index.name = "ts"
+    return df
+
+
+def _read_npz(file: str) -> pd.DataFrame:
+    with np.load(file) as z:
+        idx = pd.to_datetime(z["ts"], unit="ns")
+        return pd.DataFrame({k: z[k] for k in z.files if k != "ts"}, index=idx)
+
+
+def load_recording(path: str) -> pd.DataFrame:
+    """
+    讀取錄製的 K 線或 tick：
+    - .csv：第一欄為時間
+    - .npz：OHLCV 快取區段格式（ts + 各欄陣列）
+    - 資料夾：底下所有 .npz / .csv（例如 OHLCV 快取資料夾）
+    """
+    if os.path.isdir(path):
+        files = sorted(glob.glob(os.path.join(path, "**", "*.npz"), recursive=True)
+                       + glob.glob(os.path.join(path, "**", "*.csv"), recursive=True))
+        if not files:
+            raise FileNotFoundError(f"no recordings under {path}")
+        return _normalize(pd.concat([load_recording(f) for f in files]))
+    if path.endswith(".npz"):
+        return _normalize(_read_npz(path))
+    df = pd.read_csv(path, index_col=0, parse_dates=True)
+    if df.index.tz is not None:
+        df.index = df.index.tz_convert("UTC").tz_localize(None)
+    return _normalize(df)
+
+
+# ---------------------------------------------
+# 加速時鐘
+# ---------------------------------------------
+class ReplayClock:
+    """重播時間 = start + 經過的真實時間 × speed"""
+    def __init__(self, start: pd.Timestamp, speed: float = 1.0):
+        self.start = pd.Timestamp(start)
+        self.speed = speed
+        self._t0 = time.monotonic()
+
+    def now(self) -> pd.Timestamp:
+        return self.start + pd.Timedelta(seconds=(time.monotonic() - self._t0) * self.speed)
+
+    def set_speed(self, speed: float):
+        """改變倍速時從目前時間重新起算，避免時間跳動"""
+        self.start = self.now()
+        self._t0 = time.monotonic()
+        self.speed = speed
+
+    def wall_seconds(self, replay_seconds: float) -> float:
+        return replay_seconds / self.speed if self.speed > 0 else 0.0
+
+
+class ClockTransport(Transport):
+    """依重播時鐘把錄製資料逐筆推送成 tick（每一列都會送出，不會略過）"""
+    def __init__(self, data: pd.DataFrame, clock: ReplayClock):
+        self.data = data
+        self.clock = clock
+        self._ts = data.index.values.astype("datetime64[ns]").astype(np.int64)
+        self._close = data["Close"].to_numpy()
+        self._vol = data["Volume"].to_numpy()
+        self._i = 0
+
+    def open(self, symbol: str):
+        super().open(symbol)
+        self._i = int(np.searchsorted(self._ts, self.clock.now().value, side="right"))
+
+    def recv(self, timeout: float) -> Tick | None:
+        if self._i >= len(self._ts):
+            time.sleep(timeout)
+            return None
+        ahead = (self._ts[self._i] - self.clock.now().value) / 1e9
+        if ahead > 0 and not _sleep_until(time.monotonic() + self.clock.wall_seconds(ahead), timeout):
+            return None
+        i = self._i
+        self._i += 1
+        return Tick(self.symbol, self._ts[i] / 1e9, float(self._close[i]), float(self._vol[i]))
+
+
+# ---------------------------------------------
+# Replay fetcher（介面與 DataFetcher 相同）
+# ---------------------------------------------
+class ReplayFetcher:
+    """
+    以本地錄製檔取代交易所，供 TradingApp 以 1x–1000x 速度重播：
+    - fetch_initial：回傳重播時間之前的 K 線（週期較粗時在本地降頻）
+    - fetch_ticker_price：回傳重播時間當下的價格
+    - make_transport：把每一列錄製資料推送給 TickStream
+    - record_frame / stats：統計 GUI 更新迴圈落後重播時間多少
+    """
+
+    MAX_BARS = 3000
+
+    def __init__(self, sources: str | dict[str, str], speed: float = 1.0, warmup: int = 2000):
+        self.sources = sources
+        self.warmup = warmup
+        self._data: dict[str, pd.DataFrame] = {}
+        self._lock = threading.Lock()
+        self.clock: ReplayClock | None = None
+        self.speed = speed
+        self._lags = deque(maxlen=10_000)
+        self._frame_times = deque(maxlen=10_000)
+
+    def is_crypto(self, symbol: str) -> bool:
+        return "/" in symbol
+
+    def _load(self, symbol: str) -> pd.DataFrame:
+        with self._lock:
+            df = self._data.get(symbol)
+            if df is None:
+                path = self.sources if isinstance(self.sources, str) else self.sources[symbol]
+                df = load_recording(path)
+                self._data[symbol] = df
+            if self.clock is None:
+                start = df.index[min(self.warmup, len(df) - 1)]
+                self.clock = ReplayClock(start, self.speed)
+            return df
+
+    def _upto_now(self, symbol: str) -> pd.DataFrame:
+        df = self._load(symbol)
+        end = df.index.searchsorted(self.clock.now(), side="right")
+        return df.iloc[:max(end, 1)]
+
+    def fetch_initial(self, symbol: str, tf: str, lookback: int | None = None,
+                      race: bool | None = None) -> FetchResult:
+        df = self._upto_now(symbol)
+        if len(df) > 1:
+            resolution = (df.index[-1] - df.index[0]).total_seconds() / (len(df) - 1)
+            if tf_seconds(tf) > resolution * 1.5:
+                df = resample_ohlcv(df, tf_seconds(tf))
+        df = df.tail(lookback or self.MAX_BARS).copy()
+        return FetchResult(df, float(df["Close"].iloc[-1]), "replay", symbol=symbol)
+
+    def backfill(self, symbol: str, tf: str, bars: int, before: pd.Timestamp | None = None,
+                 **kwargs) -> FetchResult:
+        if before is None:
+            return self.fetch_initial(symbol, tf, bars)
+        res = self.fetch_initial(symbol, tf, len(self._load(symbol)))
+        df = res.df[res.df.index < before].tail(bars)
+        return FetchResult(df, res.last_price, "replay", symbol=symbol)
+
+    def _default_lookback(self, tf: str) -> int:
+        return DataFetcher._default_lookback(self, tf)
+
+    def fetch_ticker_price(self, symbol: str) -> float | None:
+        df = self._upto_now(symbol)
+        return float(df["Close"].iloc[-1]) if len(df) else None
+
+    def make_transport(self, symbol: str) -> Transport:
+        return ClockTransport(self._load(symbol), self.clock)
+
+    # -----------------------------------------
+    # 落後統計
+    # -----------------------------------------
+    def record_frame(self, last_bar_ts: pd.Timestamp, frame_seconds: float, bar_seconds: float = 0.0):
+        """
+        GUI 每畫完一次呼叫：
+        落後 = 重播時間 - (畫面上最後一根 K 線開始時間 + 一根週期)，單位為重播秒數
+        """
+        if self.clock is None:
+            return
+        lag = (self.clock.now() - last_bar_ts).total_seconds() - bar_seconds
+        self._lags.append(max(lag, 0.0))
+        self._frame_times.append(frame_seconds)
+
+    def stats(self) -> dict:
+        if not self._lags:
+            return {"frames": 0}
+        lags = np.asarray(self._lags)
+        frames = np.asarray(self._frame_times)
+        return {
+            "frames": len(lags),
+            "speed": self.clock.speed,
+            "lag_p50": float(np.percentile(lags, 50)),
+            "lag_p99": float(np.percentile(lags, 99)),
+            "lag_max": float(lags.max()),
+            "frame_ms_p50": float(np.percentile(frames, 50) * 1000),
+            "frame_ms_p99": float(np.percentile(frames, 99) * 1000),
+        }
@@ -0,0 +1,166 @@
+import time
+import threading
+import numpy as np
+import pandas as pd
+
+from .data_fetcher import FetchResult
+from .utils import tf_seconds
+
+
+def resample_ohlcv(df: pd.DataFrame, seconds: int) -> pd.DataFrame:
+    """
+    向量化 OHLCV 降頻（df 需依時間排序）：
+    以 bucket 起點切段，再用 ufunc.reduceat 一次算出每段的 High/Low/Volume。
+    """
+    if df is None or df.empty:
+        return pd.DataFrame(columns=["Open", "High", "Low", "Close", "Volume"])
+    step = seconds * 1_000_000_000
+    ts = df.index.values.astype("datetime64[ns]").astype(np.int64)
+    bucket = ts // step * step
+    starts = np.flatnonzero(np.r_[True, bucket[1:] != bucket[:-1]])
+    ends = np.r_[starts[1:] - 1, len(ts) - 1]
+
+    high = df["High"].to_numpy(dtype=np.float64)
+    low = df["Low"].to_numpy(dtype=np.float64)
+    vol = df["Volume"].to_numpy(dtype=np.float64)
+    out = pd.DataFrame({
+        "Open": df["Open"].to_numpy(dtype=np.float64)[starts],
+        "High": np.maximum.reduceat(high, starts),
+        "Low": np.minimum.reduceat(low, starts),
+        "Close": df["Close"].to_numpy(dtype=np.float64)[ends],
+        "Volume": np.add.reduceat(vol, starts),
+    }, index=pd.to_datetime(bucket[starts], unit="ns"))
+    out.index.name = df.index.name
+    return out
+
+
+class Resampler:
+    """
+    多週期本地降頻層：
+    - 每個代號只抓一次最細週期（base_tf），較粗的週期在本地以向量化方式推導
+    - 每個推導出的週期都會快取；新的 base K 線進來時只重算最後一個 bucket 之後的部分
+    - 推導出的根數與直接抓取相同（min_bars 預設取 fetcher._default_lookback(tf)），
+      base 先走快取 + 增量抓取，不夠長時才以 backfill 往回補快取裡還沒有的較舊區段
+    - 需要的 base 根數超過 max_base_bars、或來源實際給不到（例如股票 1m 只有 7 天），
+      就不抓 base，直接向來源抓該週期；給不到的上限會記住，之後不再白抓一次 base
+    """
+
+    def __init__(self, fetcher, base_tf: str = "1m", min_bars: int | None = None, base_lookback: int | None = None,
+                 max_base_bars: int = 20_000):
+        self.fetcher = fetcher
+        self.base_tf = base_tf
+        self.base_seconds = tf_seconds(base_tf)
+        self.min_bars = min_bars
+        self.base_lookback = base_lookback
+        self.max_base_bars = max_base_bars
+        self._base: dict[str, FetchResult] = {}
+        self._base_time: dict[str, float] = {}
+        self._base_limit: dict[str, int] = {}       # 代號 → 來源實際能提供的 base 根數上限
+        self._derived: dict[tuple[str, str], pd.DataFrame] = {}
+        self._lock = threading.RLock()
+
+    def can_derive(self, tf: str) -> bool:
+        """
+        週期需為 base 的整數倍、bucket 能對齊到日界（週 K 起始日不同，不推導），
+        且推出 min_bars 根所需的 base 根數不超過 max_base_bars
+        """
+        sec = tf_seconds(tf)
+        if tf.endswith("w") or sec <= self.base_seconds or sec % self.base_seconds:
+            return False
+        if not (86400 % sec == 0 or sec % 86400 == 0):
+            return False
+        return self.base_bars_needed(tf) <= self.max_base_bars
+
+    def bars_wanted(self, tf: str) -> int:
+        """推導結果至少要有的根數（未指定 min_bars 時與直接抓取的根數相同）"""
+        return self.min_bars or self.fetcher._default_lookback(tf)
+
+    def base_bars_needed(self, tf: str) -> int:
+        """推出 bars_wanted(tf) 根 tf K 線所需的 base 根數（多一個 bucket 容納未對齊的開頭）"""
+        ratio = tf_seconds(tf) // self.base_seconds
+        return (self.bars_wanted(tf) + 1) * ratio
+
+    # -----------------------------------------
+    # base 資料
+    # -----------------------------------------
+    def _load_base(self, symbol: str, bars: int = 0) -> FetchResult:
+        """
+        base 一律先走 fetch_initial（快取 + delta，暖啟動只送一個請求）；
+        長度不到 bars 根時，以 backfill 只往回補快取裡還缺的較舊區段
+        （來源單次上限如 Binance 1000 根不會卡住）。超過一根 base 週期才再做增量更新。
+        """
+        need = max(bars, self.base_lookback or 0)
+        with self._lock:
+            res = self._base.get(symbol)
+            fresh = res is not None and time.monotonic() - self._base_time[symbol] < self.base_seconds
+        if res is not None and fresh and len(res.df) >= need:
+            return res
+
+        # base 不參加多來源競速：來源要固定（backfill 只從 Binance 補），不會在交易所間換來換去
+        new = self.fetcher.fetch_initial(symbol, self.base_tf, self.base_lookback, race=False)
+        if res is not None and new.source == res.source and len(res.df) >= need:
+            self.update(symbol, new.df)
+            return self._base[symbol]
+
+        df = new.df
+        if len(df) < need and self.fetcher.is_crypto(symbol) and new.source != "synthetic":
+            older = self.fetcher.backfill(symbol, self.base_tf, need - len(df), before=df.index[0])
+            df = pd.concat([older.df, df])
+            df = df[~df.index.duplicated(keep="last")].sort_index()
+            new = FetchResult(df, new.last_price, new.source, older.cache_hits, older.cache_misses, symbol)
+        if len(df) < need:
+            self._base_limit[symbol] = len(df)
+        with self._lock:
+            self._base[symbol] = new
+            self._base_time[symbol] = time.monotonic()
+            for key in [k for k in self._derived if k[0] == symbol]:
+                del self._derived[key]
+        return new
+
+    def update(self, symbol: str, base_bars: pd.DataFrame):
+        """合併新的 base K 線，並增量更新此代號所有已推導的週期"""
+        if base_bars is None or base_bars.empty:
+            return
+        with self._lock:
+            res = self._base.get(symbol)
+            if res is None:
+                return
+            df = pd.concat([res.df, base_bars])
+            df = df[~df.index.duplicated(keep="last")].sort_index()
+            self._base[symbol] = FetchResult(df, float(df["Close"].iloc[-1]), res.source,
+                                             res.cache_hits, res.cache_misses)
+            self._base_time[symbol] = time.monotonic()
+
+            for (sym, tf), derived in list(self._derived.items()):
+                if sym != symbol:
+                    continue
+                # 從最後一個（可能未完成的）bucket 起重算
+                cutoff = derived.index[-1] if len(derived) else df.index[0]
+                fresh = resample_ohlcv(df[df.index >= cutoff], tf_seconds(tf))
+                self._derived[(sym, tf)] = pd.concat([derived[derived.index < cutoff], fresh])
+
+    # -----------------------------------------
+    # 對外介面
+    # -----------------------------------------
+    def get(self, symbol: str, tf: str) -> FetchResult:
+        if tf == self.base_tf:
+            return self._load_base(symbol)
+        if not self.can_derive(tf):
+            return self.fetcher.fetch_initial(symbol, tf)
+        need = self.base_bars_needed(tf)
+        if self._base_limit.get(symbol, need) < need:
+            # 來源給不到足夠的 base（已試過），直接抓，不再多花一次 base 請求
+            return self.fetcher.fetch_initial(symbol, tf)
+
+        base = self._load_base(symbol, need)
+        with self._lock:
+            derived = self._derived.get((symbol, tf))
+            if derived is None:
+                derived = resample_ohlcv(base.df, tf_seconds(tf))
+                self._derived[(symbol, tf)] = derived
+        if len(derived) < self.bars_wanted(tf):
+            return self.fetcher.fetch_initial(symbol, tf)
+
+        df = derived.copy()
+        return FetchResult(df, float(df["Close"].iloc[-1]), f"{base.source}({self.base_tf}→{tf})",
+                           base.cache_hits, base.cache_misses)
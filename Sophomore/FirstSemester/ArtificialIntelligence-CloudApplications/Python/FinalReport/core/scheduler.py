@@ -0,0 +1,310 @@
+import time
+import heapq
+import asyncio
+import itertools
+import threading
+import queue
+from dataclasses import dataclass
+from concurrent.futures import Future, CancelledError, TimeoutError as FutureTimeout
+
+# ---------------------------------------------
+# Optional libraries
+# ---------------------------------------------
+_HAS_CCXT = False
+try:
+    import ccxt
+    _HAS_CCXT = True
+except Exception:
+    pass
+
+# 優先權：數字越小越先執行
+PRIORITY_TICK = 0        # 即時報價
+PRIORITY_FETCH = 1       # 一般 K 線抓取
+PRIORITY_BACKFILL = 2    # 長歷史回補
+
+# 每個 host 的 (每秒請求數, 突發容量)
+DEFAULT_RATES = {
+    "binance": (10.0, 20),
+    "yfinance": (2.0, 5),
+}
+
+
+def _is_retryable(e: Exception) -> bool:
+    """429 / 限流 / 網路逾時才重試，其餘錯誤直接回報"""
+    if _HAS_CCXT and isinstance(e, (ccxt.RateLimitExceeded, ccxt.DDoSProtection, ccxt.NetworkError)):
+        return True
+    text = str(e).lower()
+    return "429" in text or "too many requests" in text or "rate limit" in text \
+        or isinstance(e, (TimeoutError, ConnectionError))
+
+
+class TokenBucket:
+    """權杖桶：每秒補充 rate 個，最多累積 capacity 個"""
+    def __init__(self, rate: float, capacity: int):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._stamp = time.monotonic()
+        self._lock = threading.Lock()
+
+    def try_acquire(self) -> float:
+        """取得一個權杖回傳 0；否則回傳還要等幾秒"""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._stamp) * self.rate)
+            self._stamp = now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return 0.0
+            return (1 - self._tokens) / self.rate
+
+    def acquire(self):
+        while True:
+            wait = self.try_acquire()
+            if wait <= 0:
+                return
+            time.sleep(wait)
+
+
+@dataclass
+class _Job:
+    priority: int
+    queued_at: float
+    host: str
+    fn: object              # None → 只取得權杖（async 呼叫端自己在 event loop 上送出請求）
+    args: tuple
+    kwargs: dict
+    fut: Future
+    cancel: threading.Event | None = None
+    attempt: int = 0
+
+
+class RequestScheduler:
+    """
+    所有對外請求（交易所 / yfinance）的集中排程器：
+    - 依 host 分開的權杖桶限速與優先權佇列（即時報價優先於回補）
+    - 單一派送執行緒只把「host 有權杖」的工作交給閒置的 worker，
+      worker 只負責送出請求，不會為了等權杖或退避而被佔住，某個 host 塞車不會拖累其他 host
+    - 遇到限流 / 網路錯誤時指數退避重試（退避期間放回延遲佇列，不佔 worker）
+    - call_async 給 asyncio 呼叫端：只向排程器要權杖，請求在呼叫端的 event loop 上送出
+    - metrics() 提供佇列深度與等待時間
+    """
+
+    def __init__(self, rates: dict | None = None, default_rate: tuple = (5.0, 5),
+                 workers: int = 4, max_retries: int = 3, backoff: float = 0.5):
+        self.rates = dict(DEFAULT_RATES, **(rates or {}))
+        self.default_rate = default_rate
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self._buckets: dict[str, TokenBucket] = {}
+        self._queues: dict[str, list] = {}          # host → heap[(priority, seq, job)]
+        self._delayed: list[tuple[float, int, _Job]] = []   # heap[(可重試時間, seq, job)]
+        self._seq = itertools.count()
+        self._cv = threading.Condition()
+        self._idle = workers
+        self._work = queue.SimpleQueue()
+        self._lock = threading.Lock()
+        self._stats = {"submitted": 0, "completed": 0, "failed": 0, "retries": 0,
+                       "wait_total": 0.0, "wait_max": 0.0, "started": 0}
+        self._per_host: dict[str, int] = {}
+        self._workers = [threading.Thread(target=self._worker, daemon=True) for _ in range(workers)]
+        self._dispatcher = threading.Thread(target=self._dispatch, daemon=True)
+        for t in (*self._workers, self._dispatcher):
+            t.start()
+
+    # -----------------------------------------
+    # 權杖桶
+    # -----------------------------------------
+    def bucket(self, host: str) -> TokenBucket:
+        with self._lock:
+            b = self._buckets.get(host)
+            if b is None:
+                b = TokenBucket(*self.rates.get(host, self.default_rate))
+                self._buckets[host] = b
+            return b
+
+    def acquire(self, host: str):
+        """直接取得權杖（呼叫端自行送出請求時使用，在呼叫端的執行緒等待）"""
+        self.bucket(host).acquire()
+        self._count_host(host)
+
+    def _count_host(self, host: str):
+        with self._lock:
+            self._per_host[host] = self._per_host.get(host, 0) + 1
+
+    # -----------------------------------------
+    # 佇列
+    # -----------------------------------------
+    def submit(self, host: str, fn, *args, priority: int = PRIORITY_FETCH,
+               cancel: threading.Event | None = None, **kwargs) -> Future:
+        fut = Future()
+        with self._lock:
+            self._stats["submitted"] += 1
+        self._enqueue(_Job(priority, time.monotonic(), host, fn, args, kwargs, fut, cancel))
+        return fut
+
+    def call(self, host: str, fn, *args, priority: int = PRIORITY_FETCH,
+             cancel: threading.Event | None = None, **kwargs):
+        """
+        submit 後阻塞等待結果（例外會原樣拋出）。
+        cancel 被 set 時：還在佇列中的請求直接撤掉、執行中的不再重試，並拋出 CancelledError
+        """
+        fut = self.submit(host, fn, *args, priority=priority, cancel=cancel, **kwargs)
+        if cancel is None:
+            return fut.result()
+        while not cancel.is_set():
+            try:
+                return fut.result(timeout=0.05)
+            except FutureTimeout:
+                pass
+        fut.cancel()
+        raise CancelledError(f"{host} request cancelled")
+
+    async def call_async(self, host: str, make_coro, priority: int = PRIORITY_FETCH):
+        """
+        asyncio 版 call：make_coro() 每次重試都建立新的 coroutine。
+        權杖照樣依 host / 優先權排隊，但請求在呼叫端的 event loop 上等待，不佔排程器 worker。
+        """
+        with self._lock:
+            self._stats["submitted"] += 1
+        for attempt in range(self.max_retries + 1):
+            fut = Future()
+            self._enqueue(_Job(priority, time.monotonic(), host, None, (), {}, fut, attempt=attempt))
+            await asyncio.wrap_future(fut)
+            try:
+                result = await make_coro()
+            except Exception as e:
+                if attempt < self.max_retries and _is_retryable(e):
+                    with self._lock:
+                        self._stats["retries"] += 1
+                    await asyncio.sleep(self.backoff * (2 ** attempt))
+                    continue
+                with self._lock:
+                    self._stats["failed"] += 1
+                raise
+            with self._lock:
+                self._stats["completed"] += 1
+            return result
+
+    def _enqueue(self, job: _Job, due: float | None = None):
+        with self._cv:
+            if due is None:
+                heapq.heappush(self._queues.setdefault(job.host, []), (job.priority, next(self._seq), job))
+            else:
+                heapq.heappush(self._delayed, (due, next(self._seq), job))
+            self._cv.notify()
+
+    # -----------------------------------------
+    # 派送（只在持有 self._cv 時呼叫）
+    # -----------------------------------------
+    def _pop_ready(self) -> tuple[_Job | None, float | None]:
+        """取出「host 有權杖」中優先權最高的工作；沒有就回傳 (None, 最多要等幾秒)"""
+        now = time.monotonic()
+        while self._delayed and self._delayed[0][0] <= now:
+            job = heapq.heappop(self._delayed)[2]
+            heapq.heappush(self._queues.setdefault(job.host, []), (job.priority, next(self._seq), job))
+        wait = self._delayed[0][0] - now if self._delayed else None
+
+        heads = []
+        for host, heap in self._queues.items():
+            while heap and (heap[0][2].fut.cancelled() or
+                            (heap[0][2].cancel is not None and heap[0][2].cancel.is_set())):
+                fut = heapq.heappop(heap)[2].fut
+                # 等待重試中的工作已經在執行狀態，無法 cancel，改以 CancelledError 結束
+                if not fut.cancel() and not fut.done():
+                    fut.set_exception(CancelledError(f"{host} request cancelled"))
+            if heap:
+                heads.append((heap[0][0], heap[0][1], host))
+        for _, _, host in sorted(heads):
+            job = self._queues[host][0][2]
+            if job.fn is not None and self._idle == 0:
+                continue        # 沒有閒置 worker；只取權杖的 async 工作不受影響
+            need = self.bucket(host).try_acquire()
+            if need <= 0:
+                heapq.heappop(self._queues[host])
+                return job, None
+            wait = need if wait is None else min(wait, need)
+        return None, wait
+
+    def _dispatch(self):
+        while True:
+            with self._cv:
+                job, wait = self._pop_ready()
+                if job is None:
+                    self._cv.wait(wait)
+                    continue
+                if job.fn is not None:
+                    self._idle -= 1
+            self._count_host(job.host)
+            if job.attempt == 0:
+                waited = time.monotonic() - job.queued_at
+                with self._lock:
+                    self._stats["started"] += 1
+                    self._stats["wait_total"] += waited
+                    self._stats["wait_max"] = max(self._stats["wait_max"], waited)
+            if job.fn is None:
+                if job.fut.set_running_or_notify_cancel():
+                    job.fut.set_result(None)
+            else:
+                self._work.put(job)
+
+    def _worker(self):
+        while True:
+            job = self._work.get()
+            try:
+                self._run(job)
+            finally:
+                with self._cv:
+                    self._idle += 1
+                    self._cv.notify()
+
+    def _run(self, job: _Job):
+        if job.attempt == 0 and not job.fut.set_running_or_notify_cancel():
+            return
+        try:
+            result = job.fn(*job.args, **job.kwargs)
+        except Exception as e:
+            cancelled = job.cancel is not None and job.cancel.is_set()
+            if job.attempt < self.max_retries and _is_retryable(e) and not cancelled:
+                with self._lock:
+                    self._stats["retries"] += 1
+                delay = self.backoff * (2 ** job.attempt)
+                job.attempt += 1
+                self._enqueue(job, due=time.monotonic() + delay)
+                return
+            with self._lock:
+                self._stats["failed"] += 1
+            job.fut.set_exception(e)
+            return
+        with self._lock:
+            self._stats["completed"] += 1
+        job.fut.set_result(result)
+
+    # -----------------------------------------
+    # 指標
+    # -----------------------------------------
+    def metrics(self) -> dict:
+        with self._lock:
+            st = dict(self._stats)
+            per_host = dict(self._per_host)
+        with self._cv:
+            depth = sum(len(h) for h in self._queues.values()) + len(self._delayed)
+        started = st.pop("started")
+        wait_total = st.pop("wait_total")
+        st["queue_depth"] = depth
+        st["wait_avg"] = wait_total / started if started else 0.0
+        st["requests_by_host"] = per_host
+        return st
+
+
+_default_scheduler = None
+_default_lock = threading.Lock()
+
+
+def get_scheduler() -> RequestScheduler:
+    """整個程式共用的排程器"""
+    global _default_scheduler
+    with _default_lock:
+        if _default_scheduler is None:
+            _default_scheduler = RequestScheduler()
+        return _default_scheduler
@@ -0,0 +1,259 @@
+import time
+import asyncio
+import threading
+from collections import deque
+from dataclasses import dataclass
+import numpy as np
+
+# ---------------------------------------------
+# Optional libraries
+# ---------------------------------------------
+_HAS_CCXT_PRO = False
+try:
+    import ccxt.pro as ccxtpro
+    _HAS_CCXT_PRO = True
+except Exception:
+    pass
+
+
+# ---------------------------------------------
+# Data container
+# ---------------------------------------------
+@dataclass
+class Tick:
+    symbol: str
+    ts: float           # epoch 秒
+    price: float
+    volume: float = 0.0
+
+
+# ---------------------------------------------
+# Transports（推送來源，可替換）
+# ---------------------------------------------
+def _sleep_until(due: float, timeout: float) -> bool:
+    """等到 due（monotonic）；超過 timeout 則只睡 timeout 並回傳 False"""
+    wait = due - time.monotonic()
+    if wait > timeout:
+        time.sleep(timeout)
+        return False
+    if wait > 0:
+        time.sleep(wait)
+    return True
+
+
+class Transport:
+    """
+    Tick 來源介面：
+    - open(symbol)：建立連線
+    - recv(timeout)：阻塞等待下一筆 tick，逾時回傳 None
+    - close()：關閉連線
+    """
+    def open(self, symbol: str):
+        self.symbol = symbol
+
+    def recv(self, timeout: float) -> Tick | None:
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+
+class PollingTransport(Transport):
+    """以 REST 輪詢模擬推送（沒有 WebSocket 時的後備方案，在背景執行緒跑）"""
+    def __init__(self, fetcher, interval: float = 1.0):
+        self.fetcher = fetcher
+        self.interval = interval
+        self._next = 0.0
+
+    def recv(self, timeout: float) -> Tick | None:
+        if not _sleep_until(self._next, timeout):
+            return None
+        self._next = time.monotonic() + self.interval
+        price = self.fetcher.fetch_ticker_price(self.symbol)
+        if price is None:
+            return None
+        return Tick(self.symbol, time.time(), float(price))
+
+
+class CcxtProTransport(Transport):
+    """
+    ccxt.pro 的 WebSocket watch_trades（需安裝 ccxt pro 版本）。
+    每筆成交一個 tick，volume 為該筆成交量；不用 watch_ticker 的 baseVolume，
+    那是 24 小時滾動成交量，逐 tick 累加進 K 線會把成交量放大成 tick 數倍。
+    """
+    def __init__(self, exchange_id: str = "binance"):
+        self.exchange_id = exchange_id
+        self._loop = None
+        self._exchange = None
+        self._pending = deque()
+        self._last_ms = 0
+
+    def open(self, symbol: str):
+        super().open(symbol)
+        self._loop = asyncio.new_event_loop()
+        self._exchange = getattr(ccxtpro, self.exchange_id)()
+        self._exchange.options["newUpdates"] = True     # 每次只回傳上次之後的新成交
+        self._pending.clear()
+        self._last_ms = 0
+
+    def recv(self, timeout: float) -> Tick | None:
+        if not self._pending:
+            try:
+                trades = self._loop.run_until_complete(
+                    asyncio.wait_for(self._exchange.watch_trades(self.symbol), timeout)
+                )
+            except asyncio.TimeoutError:
+                return None
+            for t in trades:
+                ms = t.get("timestamp") or int(time.time() * 1000)
+                if ms < self._last_ms:
+                    continue        # 重連後重送的舊成交
+                self._last_ms = ms
+                self._pending.append(Tick(self.symbol, ms / 1000.0, float(t["price"]),
+                                          float(t.get("amount") or 0.0)))
+            if not self._pending:
+                return None
+        return self._pending.popleft()
+
+    def close(self):
+        if self._exchange is not None:
+            try:
+                self._loop.run_until_complete(self._exchange.close())
+            except Exception:
+                pass
+        if self._loop is not None:
+            self._loop.close()
+
+
+class ReplayTransport(Transport):
+    """
+    重播既有的 tick（離線測試用）：
+    ticks 為 Tick 串列，speed=10 代表以 10 倍速依原始時間間隔送出；speed=0 代表不等待。
+    """
+    def __init__(self, ticks: list[Tick], speed: float = 1.0, loop: bool = False):
+        self.ticks = ticks
+        self.speed = speed
+        self.loop = loop
+        self._i = 0
+        self._t0 = None
+
+    def open(self, symbol: str):
+        super().open(symbol)
+        self._i = 0
+        self._t0 = time.monotonic()
+
+    def recv(self, timeout: float) -> Tick | None:
+        if self._i >= len(self.ticks):
+            if not self.loop or not self.ticks:
+                time.sleep(timeout)
+                return None
+            self.open(self.symbol)
+        tick = self.ticks[self._i]
+        if self.speed > 0:
+            due = self._t0 + (tick.ts - self.ticks[0].ts) / self.speed
+            if not _sleep_until(due, timeout):
+                return None
+        self._i += 1
+        return tick
+
+
+class SimulatedTransport(Transport):
+    """隨機漫步報價（可指定 seed，結果可重現）"""
+    def __init__(self, start: float = 100.0, sigma: float = 0.001,
+                 interval: float = 1.0, seed: int | None = None):
+        self.price = start
+        self.sigma = sigma
+        self.interval = interval
+        self._rng = np.random.default_rng(seed)
+        self._next = 0.0
+
+    def recv(self, timeout: float) -> Tick | None:
+        if not _sleep_until(self._next, timeout):
+            return None
+        self._next = time.monotonic() + self.interval
+        self.price *= float(np.exp(self._rng.normal(0, self.sigma)))
+        return Tick(self.symbol, time.time(), self.price, float(self._rng.integers(1, 100)))
+
+
+def default_transport(fetcher, symbol: str, interval: float = 1.0) -> Transport:
+    """fetcher 自帶 transport（例如重播）→ 用它；加密貨幣且有 ccxt.pro → WebSocket；其餘 → 背景 REST 輪詢"""
+    if hasattr(fetcher, "make_transport"):
+        return fetcher.make_transport(symbol)
+    if _HAS_CCXT_PRO and fetcher.is_crypto(symbol):
+        return CcxtProTransport()
+    return PollingTransport(fetcher, interval)
+
+
+# ---------------------------------------------
+# Tick stream（背景消費者，保留最新價格）
+# ---------------------------------------------
+class TickStream:
+    """
+    在背景執行緒持續從 transport 讀取 tick，記憶體中只保留最新一筆。
+    GUI 迴圈呼叫 last_price() 只是讀本地值，不會觸發網路請求。
+    """
+    def __init__(self, transport: Transport):
+        self.transport = transport
+        self._lock = threading.Lock()
+        self._last: Tick | None = None
+        self._subscribers = []
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self, symbol: str):
+        self.stop()
+        # 每次啟動用新的 Event：仍卡在 recv() 的舊執行緒看到的是自己那個（已 set 的）Event
+        self._stop = threading.Event()
+        self._last = None
+        self._thread = threading.Thread(target=self._run, args=(symbol, self._stop), daemon=True)
+        self._thread.start()
+
+    def stop(self, wait: bool = True, timeout: float = 2.0):
+        """
+        停止背景執行緒。wait=False 只送出停止訊號不等待（GUI 執行緒用），
+        卡在網路請求中的舊執行緒醒來後不會再派送 tick。
+        """
+        if self._thread is not None:
+            self._stop.set()
+            if wait:
+                self._thread.join(timeout)
+            self._thread = None
+
+    def subscribe(self, callback):
+        """callback(tick) 會在背景執行緒被呼叫"""
+        self._subscribers.append(callback)
+
+    def last_tick(self) -> Tick | None:
+        with self._lock:
+            return self._last
+
+    def last_price(self) -> float | None:
+        tick = self.last_tick()
+        return tick.price if tick is not None else None
+
+    def _run(self, symbol: str, stop: threading.Event):
+        try:
+            self.transport.open(symbol)
+        except Exception as e:
+            print(f"[TickStream] open failed: {e}")
+            return
+        try:
+            while not stop.is_set():
+                try:
+                    tick = self.transport.recv(timeout=0.5)
+                except Exception as e:
+                    print(f"[TickStream] recv error: {e}")
+                    stop.wait(1.0)
+                    continue
+                # recv() 可能阻塞很久，期間已被停止的話丟掉這筆
+                if tick is None or stop.is_set():
+                    continue
+                with self._lock:
+                    self._last = tick
+                for cb in list(self._subscribers):
+                    try:
+                        cb(tick)
+                    except Exception as e:
+                        print(f"[TickStream] subscriber error: {e}")
+        finally:
+            self.transport.close()
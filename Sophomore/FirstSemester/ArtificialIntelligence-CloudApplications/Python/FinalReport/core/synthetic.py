@@ -0,0 +1,83 @@
+import numpy as np
+import pandas as pd
+
+from .utils import tf_seconds
+
+
+class SyntheticMarket:
+    """
+    可重現的合成行情產生器（壓力測試 / 離線 benchmark 用）：
+    - 以 seed 建立 numpy.random.Generator，每個代號各自一條獨立亂數流
+    - 模型：gbm（幾何布朗運動）、jump（Merton 跳躍擴散）、regime（狀態切換）
+    - 所有代號、所有 K 線一次向量化產生（shape = 代號數 × 根數）
+    """
+
+    MODELS = ("gbm", "jump", "regime")
+
+    def __init__(self, seed: int | None = None):
+        self.seed = seed
+        self._seq = np.random.SeedSequence(seed)
+
+    def _rng(self) -> np.random.Generator:
+        return np.random.default_rng(self._seq.spawn(1)[0])
+
+    # -----------------------------------------
+    # 對數報酬（每列一個代號）
+    # -----------------------------------------
+    def log_returns(self, model: str, n: int, n_symbols: int = 1, mu: float = 0.0,
+                    sigma: float = 0.002, jump_lambda: float = 0.01, jump_mu: float = 0.0,
+                    jump_sigma: float = 0.02, regimes=((0.0002, 0.001), (-0.0003, 0.004)),
+                    switch_prob: float = 0.005) -> np.ndarray:
+        """
+        每根 K 線的對數報酬（mu / sigma 皆以「每根」為單位）：
+        - gbm：常態報酬，含 -sigma²/2 漂移修正
+        - jump：gbm + Poisson(jump_lambda) 次常態跳躍
+        - regime：每根以 switch_prob 機率切換到另一個 (mu, sigma) 狀態
+        """
+        rng = self._rng()
+        shape = (n_symbols, n)
+        if model == "gbm":
+            return rng.normal(mu - 0.5 * sigma ** 2, sigma, shape)
+        if model == "jump":
+            r = rng.normal(mu - 0.5 * sigma ** 2, sigma, shape)
+            k = rng.poisson(jump_lambda, shape)
+            r += k * jump_mu + np.sqrt(k) * jump_sigma * rng.standard_normal(shape)
+            return r
+        if model == "regime":
+            params = np.asarray(regimes, dtype=np.float64)
+            n_reg = len(params)
+            switch = rng.random(shape) < switch_prob
+            offset = np.where(switch, rng.integers(1, max(n_reg, 2), shape), 0)
+            start = rng.integers(0, n_reg, (n_symbols, 1))
+            state = (start + np.cumsum(offset, axis=1)) % n_reg
+            m, s = params[state, 0], params[state, 1]
+            return m - 0.5 * s ** 2 + s * rng.standard_normal(shape)
+        raise ValueError(f"unknown model: {model} (choose from {self.MODELS})")
+
+    # -----------------------------------------
+    # OHLCV 陣列
+    # -----------------------------------------
+    def ohlcv_arrays(self, model: str, n: int, n_symbols: int = 1, start: float = 100.0,
+                     **params) -> dict[str, np.ndarray]:
+        """回傳 Open/High/Low/Close/Volume 五個 (代號數 × 根數) 陣列"""
+        r = self.log_returns(model, n, n_symbols, **params)
+        rng = self._rng()
+        start = np.broadcast_to(np.asarray(start, dtype=np.float64), (n_symbols,))[:, None]
+        close = start * np.exp(np.cumsum(r, axis=1))
+        open_ = np.concatenate([start, close[:, :-1]], axis=1)
+        wick = params.get("sigma", 0.002) * 0.5
+        high = np.maximum(open_, close) * np.exp(np.abs(rng.normal(0, wick, r.shape)))
+        low = np.minimum(open_, close) * np.exp(-np.abs(rng.normal(0, wick, r.shape)))
+        volume = rng.lognormal(6.0, 0.5, r.shape) * (1 + np.abs(r) / max(wick, 1e-12))
+        return {"Open": open_, "High": high, "Low": low, "Close": close, "Volume": volume}
+
+    def generate(self, symbols: int | list[str] = 1, n: int = 1000, model: str = "gbm",
+                 tf: str = "1m", end=None, start: float = 100.0, **params) -> dict[str, pd.DataFrame]:
+        """產生多個代號的 OHLCV DataFrame（與 DataFetcher 的欄位格式相同，時間為 naive UTC）"""
+        names = [f"SYN{i}" for i in range(symbols)] if isinstance(symbols, int) else list(symbols)
+        arrays = self.ohlcv_arrays(model, n, len(names), start=start, **params)
+        idx = pd.date_range(end=end or pd.Timestamp.now("UTC").tz_localize(None), periods=n, freq=pd.Timedelta(seconds=tf_seconds(tf)))
+        return {
+            name: pd.DataFrame({col: arr[i] for col, arr in arrays.items()}, index=idx)
+            for i, name in enumerate(names)
+        }
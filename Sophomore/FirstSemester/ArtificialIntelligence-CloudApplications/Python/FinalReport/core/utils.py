@@ -16,3 +16,11 @@ def tf_tier(tf: str):
     if tf.endswith("s"): return "sec"
     if tf.endswith("m"): return "min"
     return "hour"
+
+def tf_seconds(tf: str) -> int:
+    """timeframe 轉成秒數（例如 5m → 300）"""
+    unit = {"s": 1, "m": 60, "h": 3600, "d": 86400, "w": 604800}.get(tf[-1:], 60)
+    try:
+        return int(tf[:-1]) * unit
+    except ValueError:
+        return unit
@@ -1,4 +1,6 @@
 import threading
+import time
+from functools import partial
 import re
 import numpy as np
 import pandas as pd
@@ -15,37 +17,59 @@ matplotlib.rcParams['font.sans-serif'] = ['Microsoft JhengHei', 'SimHei', 'Arial
 matplotlib.rcParams['axes.unicode_minus'] = False
 
 from core import (
-    DataFetcher, Predictor, rsi, macd, Sounder,
-    tf_tier, REFRESH_BY_TIER, TIMEFRAME_CHOICES
+    DataFetcher, Resampler, ForecastPool, available_backends, rsi, macd, Sounder, TickStream, BarBuilder, TickRecorder,
+    default_transport, SimulatedTransport,
+    tf_tier, tf_seconds, REFRESH_BY_TIER, TIMEFRAME_CHOICES
 )
+from .chart import LiveChart
 
 
 class TradingApp:
-    def __init__(self, root: ttk.Window):
+    def __init__(self, root: ttk.Window, fetcher=None):
         self.root = root
         self.root.title("AI 智慧交易視覺系統")
         self.root.state("zoomed")
         ttk.Style("cyborg")
 
         # --- 模組初始化 ---
-        self.fetcher = DataFetcher()
-        self.predictor = Predictor()
+        self.fetcher = fetcher or DataFetcher(race=True)  # 可傳入 ReplayFetcher 重播錄製資料
+        self.resampler = Resampler(self.fetcher)     # 粗週期由 1m 在本地推導
+        self.forecast_pool = ForecastPool(predictor_kwargs={"persist": True})   # 模型訓練移到背景程序，已擬合模型存到磁碟
         self.sounder = Sounder()
+        # 錄製即時資料（重播模式不錄）
+        self.recorder = TickRecorder() if isinstance(self.fetcher, DataFetcher) else None
+        if self.recorder is not None:
+            self.recorder.start()
 
         # --- 狀態變數 ---
         self.symbol_var = tk.StringVar(value="BTC/USDT")
         self.tf_var = tk.StringVar(value="1m")
         self.horizon_var = tk.StringVar(value="3")      # 預測根數（使用者可輸入任意整數）
+        self.backend_var = tk.StringVar(value="prophet")   # 預測模型（可改 auto 依擬合時間自動挑選）
         self.threshold_var = tk.DoubleVar(value=1)      # 以「百分比」輸入；1 = 1%
         self.show_band_var = tk.BooleanVar(value=True)  # 顯示/隱藏預測區間
         self.df = pd.DataFrame()
+        self.source = ""            # 目前資料來源（synthetic 時即時價也改用模擬串流）
         self.pred_df = pd.DataFrame()
         self.update_job = None
+        self.stream = None          # 背景 tick 串流（GUI 只讀最新價）
+        self.bars = None            # tick → K 線聚合（秒級週期也有真正的 K 線）
 
         # --- GUI 組件 ---
         self._build_topbar()
         self._build_metrics_frame()
         self._build_chart()
+        self.root.protocol("WM_DELETE_WINDOW", self._on_close)
+        self.root.after(100, self._poll_forecast)
+
+    def _on_close(self):
+        """關閉視窗前停止串流並寫出錄製緩衝"""
+        if self.stream is not None:
+            self.stream.stop(wait=False)
+        if self.recorder is not None:
+            self.recorder.stop()
+        self.forecast_pool.shutdown()
+        self.root.destroy()
 
     # ==========================================================
     # 🧱 GUI 組件
@@ -64,6 +88,11 @@ class TradingApp:
         ttk.Label(top, text="預測範圍").pack(side=LEFT, padx=(10, 0))
         self.ent_h = ttk.Entry(top, textvariable=self.horizon_var, width=6)
         self.ent_h.pack(side=LEFT)
+        self.ent_h.bind("<Return>", lambda e: self._recompute_pred())
+
+        ttk.Label(top, text="模型").pack(side=LEFT, padx=(10, 0))
+        ttk.Combobox(top, textvariable=self.backend_var, values=["auto"] + available_backends(),
+                     width=12, state="readonly").pack(side=LEFT)
 
         ttk.Label(top, text="閾值(%)").pack(side=LEFT, padx=(10, 0))
         ttk.Entry(top, textvariable=self.threshold_var, width=6).pack(side=LEFT)
@@ -112,6 +141,7 @@ class TradingApp:
         self.toolbar = NavigationToolbar2Tk(self.canvas, frm, pack_toolbar=False)
         self.toolbar.update()
         self.toolbar.pack(side=TOP, fill=X)
+        self.chart = LiveChart(self.fig, self.ax_main[0], self.ax_main[1], self.canvas)
 
     # ==========================================================
     # ⚙️ 主要流程
@@ -131,32 +161,81 @@ class TradingApp:
         threading.Thread(target=self._fetch_data, args=(sym, tf), daemon=True).start()
 
     def _fetch_data(self, symbol, tf):
-        res = self.fetcher.fetch_initial(symbol, tf)
+        res = self.resampler.get(symbol, tf)
         self.df = res.df
-        self.lbl_src.configure(text=f"來源：{res.source}")
+        self.source = res.source
+        total = res.cache_hits + res.cache_misses
+        cache_txt = f"（快取命中 {res.cache_hits}/{total}）" if total else ""
+        self.lbl_src.configure(text=f"來源：{res.source}{cache_txt}")
         self.root.after(0, self._after_data_loaded)
 
     def _after_data_loaded(self):
+        self._start_stream(self.symbol_var.get().strip())
         self._recompute_pred()
+        self.chart.reset_view()
         self._draw_chart()
         self._schedule_update()
 
+    def _start_stream(self, symbol):
+        """切換代號時重建 tick 串流（不在 GUI 執行緒等待舊串流結束）"""
+        if self.stream is not None:
+            self.stream.stop(wait=False)
+        tf = self.tf_var.get()
+        interval = REFRESH_BY_TIER.get(tf_tier(tf), 10_000) / 1000
+        self.bars = BarBuilder(tf, capacity=max(len(self.df), 3000))
+        self.bars.seed(self.df)
+        if self.source == "synthetic" and len(self.df) > 0:
+            # 抓不到真實資料：即時價也用模擬串流，不錄製，也不會把假價格混進真實 K 線
+            transport = SimulatedTransport(start=float(self.df["Close"].iloc[-1]), interval=interval)
+            recorder = None
+        else:
+            transport = default_transport(self.fetcher, symbol, interval)
+            recorder = self.recorder
+        self.stream = TickStream(transport)
+        # callback 綁定這次的 BarBuilder / 代號 / 週期 / 錄製器，舊串流遲到的 tick 不會寫進新代號的 K 線
+        self.stream.subscribe(partial(self._on_tick, self.bars, symbol, tf, recorder))
+        self.stream.start(symbol)
+
+    def _on_tick(self, bars, symbol, tf, recorder, tick):
+        """背景執行緒：聚合 K 線，並把 tick 與剛收盤的 K 線交給錄製器（不可碰 Tk 變數）"""
+        if tick.symbol != symbol:
+            return
+        if bars.update(tick.ts, tick.price, tick.volume) and recorder is not None and len(bars) > 1:
+            recorder.record_bars(symbol, tf, bars.to_frame(last=2).iloc[:1])
+        if recorder is not None:
+            recorder.record_tick(tick)
+
     def _recompute_pred(self):
         try:
             steps = int(self.horizon_var.get())
         except Exception:
             steps = 3
         tf = self.tf_var.get()
-        self.pred_df = self.predictor.forecast(self.df, steps=steps, tf=tf)
+        sym = self.symbol_var.get().strip()
+        if len(self.df) == 0:
+            return
+        # 丟到程序池，結果由 _poll_forecast 取回
+        self.forecast_pool.submit(self.df, steps=steps, tf=tf, symbol=sym, backend=self.backend_var.get())
         self._update_pred_range_label()
 
+    def _poll_forecast(self):
+        """以 root.after 輪詢背景預測結果，有新結果才重畫"""
+        try:
+            res = self.forecast_pool.poll(self.symbol_var.get().strip(), self.tf_var.get())
+            if res is not None:
+                self.pred_df = res
+                self._draw_chart()
+                self._update_metrics()
+        finally:
+            self.root.after(100, self._poll_forecast)
+
     def _schedule_update(self):
         tier = tf_tier(self.tf_var.get())
         interval = REFRESH_BY_TIER.get(tier, 10_000)
         self.update_job = self.root.after(interval, self._update_loop)
 
     def _update_loop(self):
-        sym = self.symbol_var.get().strip()
+        t_start = time.perf_counter()
         tf = self.tf_var.get()
 
         # 閾值（百分比 → 小數）
@@ -165,16 +244,10 @@ class TradingApp:
         except ValueError:
             th = 0.01  # fallback 1%
 
-        # 實時價格（ticker）或 fallback 隨機微變化
-        new_price = self.fetcher.fetch_ticker_price(sym)
-        if new_price is None:
-            new_price = float(self.df["Close"].iloc[-1]) + np.random.normal(0, 0.1)
-
-        # 更新最後一根 close（保持 timeframe 解耦的即時變化）
-        if len(self.df) == 0:
-            self.df = pd.DataFrame({"Close": [new_price]}, index=[pd.Timestamp.utcnow()])
-        else:
-            self.df.iloc[-1, self.df.columns.get_loc("Close")] = new_price
+        # 背景串流已把 tick 寫入 K 線聚合器（依 bucket 邊界滾動出新 K 線，或更新形成中的最後一根）；
+        # 還沒收到 tick / 輪詢失敗時畫面維持原樣，不寫入隨機價格
+        if self.bars is not None:
+            self.df = self.bars.to_frame()
 
         # 重新預測與重畫
         self._recompute_pred()
@@ -191,6 +264,10 @@ class TradingApp:
         except Exception:
             pass
 
+        # 重播模式：記錄畫面落後重播時間多少
+        if hasattr(self.fetcher, "record_frame") and len(self.df) > 0:
+            self.fetcher.record_frame(self.df.index[-1], time.perf_counter() - t_start, tf_seconds(tf))
+
         self._schedule_update()
 
     # ==========================================================
@@ -216,65 +293,9 @@ class TradingApp:
             self.vola_var.set("—")
 
     def _draw_chart(self):
-        """繪製：上方 AI 預測（含區間帶 + 閾值線）、下方 即時價格線"""
-        for ax in self.ax_main:
-            ax.clear()
-
-        df_to_plot = self.df.tail(300)
-        close = df_to_plot["Close"] if "Close" in df_to_plot.columns else pd.Series(dtype=float)
-
-        # 即時價與閾值
-        real = float(self.df["Close"].iloc[-1]) if len(self.df) > 0 else 0.0
+        """繪製：上方 AI 預測（含區間帶 + 閾值線）、下方 即時價格線（artist 只建立一次、依可視範圍降採樣，見 gui/chart.py）"""
         th = float(self.threshold_var.get()) / 100.0
-        upper_line = real * (1 + th)
-        lower_line = real * (1 - th)
-
-        # --- 上方圖：AI 預測 + 區間 + 閾值 ---
-        self.ax_main[0].set_title("AI 預測與閾值範圍", fontsize=12, pad=8)
-        self.ax_main[0].set_ylabel("預測價格")
-        self.ax_main[0].grid(True, linestyle="--", alpha=0.3)
-
-        if len(self.pred_df) > 0:
-            # 把預測拼接到歷史尾端（前段用 NaN 補齊，以對齊 X 軸）
-            base_index = df_to_plot.index
-            yhat_full = pd.concat([pd.Series(np.nan, index=base_index), self.pred_df.get("yhat", pd.Series(dtype=float))])
-
-            self.ax_main[0].plot(
-                yhat_full.index, yhat_full.values,
-                color="orange", linewidth=1.8, label="AI 預測線"
-            )
-
-            # ✅ 顯示預測區間（上/下界 + 灰色填滿）
-            if self.show_band_var.get() and "yhat_upper" in self.pred_df.columns and "yhat_lower" in self.pred_df.columns:
-                up_full = pd.concat([pd.Series(np.nan, index=base_index), self.pred_df["yhat_upper"]])
-                low_full = pd.concat([pd.Series(np.nan, index=base_index), self.pred_df["yhat_lower"]])
-
-                # 灰色虛線（上/下界）
-                self.ax_main[0].plot(up_full.index, up_full.values, color="gray", linestyle="--", linewidth=1, alpha=0.9, label="預測上界")
-                self.ax_main[0].plot(low_full.index, low_full.values, color="gray", linestyle="--", linewidth=1, alpha=0.9, label="預測下界")
-
-                # 區間帶填色（半透明）
-                self.ax_main[0].fill_between(
-                    up_full.index, low_full.values, up_full.values,
-                    color="gray", alpha=0.12, step=None
-                )
-
-        # 閾值提示線（綠上紅下）
-        self.ax_main[0].axhline(upper_line, color="lime", linestyle="--", linewidth=1, alpha=0.75, label=f"+{th*100:.1f}% 閾值線（多頭）")
-        self.ax_main[0].axhline(lower_line, color="red", linestyle="--", linewidth=1, alpha=0.75, label=f"-{th*100:.1f}% 閾值線（空頭）")
-
-        # --- 下方圖：即時價格 ---
-        self.ax_main[1].set_ylabel("即時價格")
-        self.ax_main[1].grid(True, linestyle="--", alpha=0.3)
-        if len(close) > 0:
-            self.ax_main[1].plot(
-                close.index, close.values,
-                color="deepskyblue", linewidth=1.2, label="即時價格線"
-            )
-
-        self.ax_main[0].legend(loc="upper left")
-        self.ax_main[1].legend(loc="upper left")
-        self.canvas.draw()
+        self.chart.update(self.df, self.pred_df, th, self.show_band_var.get())
 
     def _update_pred_range_label(self):
         tf = self.tf_var.get()
@@ -0,0 +1,238 @@
+import numpy as np
+import pandas as pd
+import matplotlib.dates as mdates
+
+from core import downsample
+
+
+def _xnum(index) -> np.ndarray:
+    """DatetimeIndex → Matplotlib 日期數值（直接 set_data，不經過單位轉換）"""
+    if len(index) == 0:
+        return np.empty(0)
+    return mdates.date2num(pd.DatetimeIndex(index).values)
+
+
+class LiveChart:
+    """
+    保留模式（retained-mode）圖表：
+    - 所有 artist（預測線、上下界、區間帶、閾值線、價格線、圖例）只建立一次，之後只 set_data
+    - 即時價格線與閾值線設為 animated，只在 tick 更新時以 blit 重畫這幾條線
+    - 預測結果改變或座標範圍需要改變時才做一次完整 canvas.draw()（重新排版）
+    - y 軸範圍留有邊距，價格在範圍內小幅跳動不會觸發重新排版
+    - 價格線只畫目前可視範圍，並依軸的像素寬度降採樣（LOD），
+      平移 / 縮放 10 萬根以上的歷史時頂點數固定；可視範圍貼著最新 K 線時自動跟隨
+    """
+
+    def __init__(self, fig, ax_pred, ax_price, canvas, margin: float = 0.1,
+                 window: int = 300, lod: str = "minmax"):
+        self.fig = fig
+        self.ax_pred = ax_pred
+        self.ax_price = ax_price
+        self.canvas = canvas
+        self.margin = margin
+        self.window = window        # 預設可視根數
+        self.lod = lod              # "minmax" 或 "lttb"
+        self._x_all = np.empty(0)
+        self._y_all = np.empty(0)
+        self._follow = True         # 可視範圍右緣貼著最新資料時自動跟隨
+        self._span = None           # 跟隨時的可視寬度（日期數值）
+        self._setting_xlim = False
+        self._x_key = None
+        self._bg = None
+        self._pred_ref = None       # 目前畫出的預測 DataFrame（以物件身分判斷是否換了新預測）
+        self._band_shown = None
+        self._th = None
+
+        # --- 上方圖：AI 預測 + 區間 + 閾值 ---
+        ax_pred.set_title("AI 預測與閾值範圍", fontsize=12, pad=8)
+        ax_pred.set_ylabel("預測價格")
+        ax_pred.grid(True, linestyle="--", alpha=0.3)
+        self.pred_line, = ax_pred.plot([], [], color="orange", linewidth=1.8, label="AI 預測線")
+        self.upper_line, = ax_pred.plot([], [], color="gray", linestyle="--", linewidth=1, alpha=0.9, label="預測上界")
+        self.lower_line, = ax_pred.plot([], [], color="gray", linestyle="--", linewidth=1, alpha=0.9, label="預測下界")
+        self.band = ax_pred.fill_between([], [], [], color="gray", alpha=0.12)
+        # 閾值提示線（綠上紅下）
+        self.th_up = ax_pred.axhline(np.nan, color="lime", linestyle="--", linewidth=1, alpha=0.75,
+                                     label="閾值線（多頭）", animated=True)
+        self.th_down = ax_pred.axhline(np.nan, color="red", linestyle="--", linewidth=1, alpha=0.75,
+                                       label="閾值線（空頭）", animated=True)
+
+        # --- 下方圖：即時價格 ---
+        ax_price.set_ylabel("即時價格")
+        ax_price.grid(True, linestyle="--", alpha=0.3)
+        self.price_line, = ax_price.plot([], [], color="deepskyblue", linewidth=1.2,
+                                         label="即時價格線", animated=True)
+        ax_price.xaxis_date()
+
+        self.legend_pred = ax_pred.legend(loc="upper left")
+        self.legend_price = ax_price.legend(loc="upper left")
+        self._animated = (self.th_up, self.th_down, self.price_line)
+
+        # 任何完整重畫（縮放、視窗大小改變、工具列）後重新擷取背景
+        canvas.mpl_connect("draw_event", self._on_draw)
+        # 平移 / 縮放時重新依可視範圍降採樣
+        ax_price.callbacks.connect("xlim_changed", self._on_xlim)
+
+    # -----------------------------------------
+    # blit
+    # -----------------------------------------
+    def _on_draw(self, event):
+        self._bg = self.canvas.copy_from_bbox(self.fig.bbox)
+        self._draw_animated()
+
+    def _draw_animated(self):
+        for artist in self._animated:
+            artist.axes.draw_artist(artist)
+
+    def _blit(self):
+        if self._bg is None:
+            self.canvas.draw()
+            return
+        self.canvas.restore_region(self._bg)
+        self._draw_animated()
+        self.canvas.blit(self.fig.bbox)
+
+    # -----------------------------------------
+    # 座標範圍（只有超出或明顯縮小時才改）
+    # -----------------------------------------
+    def _fit_ylim(self, ax, lo: float, hi: float) -> bool:
+        if not (np.isfinite(lo) and np.isfinite(hi)):
+            return False
+        cur_lo, cur_hi = ax.get_ylim()
+        span = max(hi - lo, abs(hi) * 1e-4, 1e-12)
+        inside = cur_lo <= lo and hi <= cur_hi
+        too_loose = (cur_hi - cur_lo) > span * (1 + 4 * self.margin)
+        if inside and not too_loose:
+            return False
+        ax.set_ylim(lo - span * self.margin, hi + span * self.margin)
+        return True
+
+    def _fit_xlim(self, x0: float, x1: float) -> bool:
+        if not (np.isfinite(x0) and np.isfinite(x1)) or x1 <= x0:
+            return False
+        if tuple(self.ax_price.get_xlim()) == (x0, x1):
+            return False
+        self._setting_xlim = True
+        try:
+            self.ax_price.set_xlim(x0, x1)
+        finally:
+            self._setting_xlim = False
+        return True
+
+    # -----------------------------------------
+    # LOD：只取可視範圍並依像素寬度降採樣
+    # -----------------------------------------
+    def _visible_price(self) -> tuple[np.ndarray, np.ndarray]:
+        x, y = self._x_all, self._y_all
+        if len(x) == 0:
+            return x, y
+        left, right = self.ax_price.get_xlim()
+        # 左右各多取一點，線段才會延伸到邊界
+        i0 = max(int(np.searchsorted(x, left, side="left")) - 1, 0)
+        i1 = min(int(np.searchsorted(x, right, side="right")) + 1, len(x))
+        if i1 <= i0:
+            return x[:0], y[:0]
+        return downsample(x[i0:i1], y[i0:i1], self.ax_price.bbox.width, self.lod)
+
+    def _refresh_price(self) -> bool:
+        """重設價格線資料；回傳價格軸 y 範圍是否改變"""
+        xv, yv = self._visible_price()
+        self.price_line.set_data(xv, yv)
+        if len(yv) and np.isfinite(yv).any():
+            return self._fit_ylim(self.ax_price, float(np.nanmin(yv)), float(np.nanmax(yv)))
+        return False
+
+    def _on_xlim(self, ax):
+        if self._setting_xlim:
+            return
+        # 使用者平移 / 縮放：右緣仍在最新資料之後才繼續跟隨
+        left, right = ax.get_xlim()
+        self._follow = len(self._x_all) == 0 or right >= self._x_all[-1]
+        self._span = right - left
+        self._refresh_price()
+
+    # -----------------------------------------
+    # 對外介面
+    # -----------------------------------------
+    def reset_view(self):
+        """切換代號 / 週期時回到預設視窗（最後 window 根）並恢復跟隨"""
+        self._follow = True
+        self._span = None
+
+    def update(self, df: pd.DataFrame, pred_df: pd.DataFrame, th: float, show_band: bool = True):
+        """更新資料；需要重新排版時做完整重畫，否則只 blit 即時價格線與閾值線"""
+        close = df["Close"] if "Close" in df.columns else pd.Series(dtype=float)
+        # 時間軸沒變（只是最後一根在更新）時沿用上次轉換好的 x，長歷史不必每個 tick 重轉
+        idx = close.index
+        x_key = (len(idx), idx[0], idx[-1]) if len(idx) else None
+        if x_key != self._x_key:
+            self._x_all, self._x_key = _xnum(idx), x_key
+        x_price = self._x_all
+        y_price = close.to_numpy(dtype=np.float64)
+        self._y_all = y_price
+
+        # 即時價與閾值
+        real = float(y_price[-1]) if len(y_price) else np.nan
+        upper, lower = real * (1 + th), real * (1 - th)
+        self.th_up.set_ydata([upper, upper])
+        self.th_down.set_ydata([lower, lower])
+
+        full_redraw = False
+        if th != self._th:
+            self._th = th
+            texts = self.legend_pred.get_texts()
+            texts[3].set_text(f"+{th*100:.1f}% 閾值線（多頭）")
+            texts[4].set_text(f"-{th*100:.1f}% 閾值線（空頭）")
+            full_redraw = True
+
+        # 預測只有在結果（或區間帶顯示與否）改變時才更新
+        has_pred = pred_df is not None and len(pred_df) > 0
+        x_end = x_price[-1] if len(x_price) else np.nan
+        lo_pred, hi_pred = lower, upper
+        if has_pred:
+            x_pred = _xnum(pred_df.index)
+            yhat = pred_df["yhat"].to_numpy(dtype=np.float64)
+            x_end = max(x_end, x_pred[-1]) if np.isfinite(x_end) else x_pred[-1]
+            lo_pred, hi_pred = np.nanmin([lo_pred, *yhat]), np.nanmax([hi_pred, *yhat])
+            band = show_band and {"yhat_upper", "yhat_lower"} <= set(pred_df.columns)
+            if band:
+                y_up = pred_df["yhat_upper"].to_numpy(dtype=np.float64)
+                y_low = pred_df["yhat_lower"].to_numpy(dtype=np.float64)
+                lo_pred, hi_pred = min(lo_pred, np.nanmin(y_low)), max(hi_pred, np.nanmax(y_up))
+            if pred_df is not self._pred_ref or show_band != self._band_shown:
+                self.pred_line.set_data(x_pred, yhat)
+                if band:
+                    self.upper_line.set_data(x_pred, y_up)
+                    self.lower_line.set_data(x_pred, y_low)
+                    self._set_band(x_pred, y_low, y_up)
+                for artist in (self.upper_line, self.lower_line, self.band):
+                    artist.set_visible(band)
+                full_redraw = True
+        elif self._pred_ref is not None:
+            for artist in (self.pred_line, self.upper_line, self.lower_line):
+                artist.set_data([], [])
+            self.band.set_visible(False)
+            full_redraw = True
+        self._pred_ref = pred_df if has_pred else None
+        self._band_shown = show_band
+
+        # 跟隨模式：保持可視寬度，右緣對齊最新 K 線 / 預測尾端
+        if self._follow and len(x_price):
+            if self._span is None:
+                self._span = x_end - x_price[max(len(x_price) - self.window, 0)]
+            full_redraw |= self._fit_xlim(x_end - self._span, x_end)
+        full_redraw |= self._refresh_price()
+        full_redraw |= self._fit_ylim(self.ax_pred, lo_pred, hi_pred)
+
+        if full_redraw:
+            self.canvas.draw()      # 觸發 draw_event → 重新擷取背景並畫上 animated 線
+        else:
+            self._blit()
+
+    def _set_band(self, x, lo, hi):
+        if hasattr(self.band, "set_data"):
+            self.band.set_data(x, lo, hi)
+        else:
+            # 舊版 Matplotlib 沒有 FillBetweenPolyCollection.set_data，只好換掉這一個 artist
+            self.band.remove()
+            self.band = self.ax_pred.fill_between(x, lo, hi, color="gray", alpha=0.12)
@@ -0,0 +1,67 @@
+"""
+串流版指標測試：StreamingEMA / StreamingRSI / StreamingMACD 的 update 與 revise
+逐根結果需與批次版 ema / rsi / macd 一致（固定亂數種子的隨機漫步序列）。
+
+執行：python -m pytest tests
+"""
+import os
+import sys
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core import ema, rsi, macd, StreamingEMA, StreamingRSI, StreamingMACD
+
+
+@pytest.fixture(scope="module")
+def close() -> pd.Series:
+    rng = np.random.default_rng(42)
+    return pd.Series(100 + np.cumsum(rng.normal(0, 1, 2000)))
+
+
+def _run(ind, values, revise: bool) -> list:
+    """逐根餵入；revise=True 時每根先以錯誤的值開 K 線，再 revise 幾次，最後改回真值"""
+    out = []
+    for x in values:
+        if revise:
+            ind.update(x * 1.05)
+            ind.revise(x * 0.9)
+            ind.revise(np.nan)      # 非有限值不改變狀態
+            out.append(ind.revise(x))
+        else:
+            out.append(ind.update(x))
+    return out
+
+
+@pytest.mark.parametrize("revise", [False, True])
+@pytest.mark.parametrize("span", [5, 20])
+def test_streaming_ema(close, span, revise):
+    got = np.array(_run(StreamingEMA(span), close, revise))
+    assert np.allclose(got, ema(close, span).to_numpy(), equal_nan=True)
+
+
+@pytest.mark.parametrize("revise", [False, True])
+@pytest.mark.parametrize("period", [7, 14])
+def test_streaming_rsi(close, period, revise):
+    got = np.array(_run(StreamingRSI(period), close, revise))
+    want = rsi(close, period).to_numpy()
+    assert np.array_equal(np.isnan(got), np.isnan(want))
+    assert np.allclose(got, want, equal_nan=True)
+
+
+@pytest.mark.parametrize("revise", [False, True])
+def test_streaming_macd(close, revise):
+    got = np.array(_run(StreamingMACD(12, 26, 9), close, revise))
+    want = np.column_stack([s.to_numpy() for s in macd(close, 12, 26, 9)])
+    assert np.allclose(got, want, equal_nan=True)
+
+
+def test_seed_then_update_matches_batch(close):
+    head, tail = close.iloc[:1500], close.iloc[1500:]
+    ind = StreamingRSI(14)
+    ind.seed(head)
+    assert np.isclose(ind.value, rsi(head, 14).iloc[-1])
+    got = [ind.update(x) for x in tail]
+    assert np.allclose(got, rsi(close, 14).iloc[1500:].to_numpy(), equal_nan=True)